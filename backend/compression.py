@@ -0,0 +1,194 @@
+"""Negotiated gzip/brotli response compression.
+
+``CompressionMiddleware`` compresses responses on the fly, including streamed ones.
+``negotiate_encoding`` and ``compress`` are also used by the response cache so it can
+keep compressed bodies and skip recompressing on every hit.
+"""
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def supported_encodings() -> tuple:
+    """Encodings in server preference order"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header, or None for identity"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+
+    candidates = [
+        (accepted.get(coding, accepted.get("*", 0.0)), -rank, coding)
+        for rank, coding in enumerate(supported_encodings())
+    ]
+    quality, _, coding = max(candidates)
+    return coding if quality > 0 else None
+
+
+# Server-sent events must reach the client one at a time, and proxies tend to buffer
+# compressed streams
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.split(";")[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) and content_type not in UNCOMPRESSED_TYPES
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # wbits 31 writes a gzip container
+    return compressor.compress(body) + compressor.flush()
+
+
+def weaken_etag(etag: str) -> str:
+    """A strong ETag no longer identifies the bytes once they are re-encoded"""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self._flush = self._compressor.flush
+            self._finish = self._compressor.finish
+            self._compress = self._compressor.process
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self._flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._compressor.flush
+            self._compress = self._compressor.compress
+
+    def chunk(self, data: bytes) -> bytes:
+        # Flush every chunk so streamed exports reach the client as they are produced
+        return self._compress(data) + self._flush()
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+class CompressionMiddleware:
+    """Compress responses for clients that accept gzip or brotli.
+
+    Bodies below ``minimum_size``, non-text content types and responses that already
+    carry a Content-Encoding (such as precompressed cache hits) are passed through.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6,
+                 brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self, encoding, send).run(self.app, scope, receive)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_StreamCompressor] = None
+        self.passthrough = False
+
+    async def run(self, app: ASGIApp, scope: Scope, receive: Receive):
+        await app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message):
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or not is_compressible(headers.get("content-type", ""))
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body:
+                await self._send_whole(body)
+                return
+            await self._start_stream()
+
+        data = self.compressor.chunk(body)
+        if not more_body:
+            data += self.compressor.finish()
+        if data or not more_body:
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _compressed_headers(self) -> MutableHeaders:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if "etag" in headers:
+            headers["ETag"] = weaken_etag(headers["etag"])
+        return headers
+
+    async def _send_whole(self, body: bytes):
+        if len(body) < self.middleware.minimum_size:
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+        compressed = compress(body, self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+        headers = self._compressed_headers()
+        headers["Content-Length"] = str(len(compressed))
+        await self.send(self.start_message)
+        await self.send({"type": "http.response.body", "body": compressed})
+
+    async def _start_stream(self):
+        headers = self._compressed_headers()
+        del headers["Content-Length"]
+        self.compressor = _StreamCompressor(
+            self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+        )
+        await self.send(self.start_message)
@@ -0,0 +1,184 @@
+"""Cross-worker cache invalidation.
+
+Each uvicorn worker keeps its own response and fixture-name caches, so a write served
+by one worker has to reach the caches of the others. ``InvalidationBus`` delivers
+"collection changed" notices to every worker in one of two ways:
+
+``change_streams``
+    Watch the database with a change stream (replica sets and sharded clusters). Every
+    write is seen, including those made by other tools such as manage.py, and
+    ``publish`` has nothing to do.
+``capped``
+    A stand-in for standalone mongod: workers publish notices into a small capped
+    collection and tail it with a tailable cursor, skipping their own notices.
+
+``auto`` picks change streams when the deployment supports them and falls back to the
+capped collection otherwise. Whenever a worker (re)starts listening it may have missed
+notices, so it invalidates everything once before resuming.
+"""
+import asyncio
+import logging
+import uuid
+from typing import Callable, Iterable, Optional
+
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid, OperationFailure, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# "The $changeStream stage is only supported on replica sets"
+CHANGE_STREAMS_UNSUPPORTED = 40573
+RETRY_SECONDS = 1.0
+# Pause between getMores once a tailable cursor has caught up; the server already waits up
+# to a second for new notices before answering one
+IDLE_POLL_SECONDS = 0.05
+
+
+class InvalidationBus:
+    MODES = ("none", "auto", "change_streams", "capped")
+
+    def __init__(self, collections: Iterable[str], on_change: Callable[[str], None],
+                 mode: str = "none", channel: str = "cache_invalidations",
+                 channel_size: int = 16 * 1024 * 1024):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown cache invalidation mode {mode!r}; expected one of {', '.join(self.MODES)}")
+        self.collections = tuple(collections)
+        self.on_change = on_change
+        self.mode = mode
+        self.channel = channel
+        self.channel_size = channel_size
+        self.origin = uuid.uuid4().hex
+        self.active_mode: Optional[str] = None
+        self.received = self.published = self.restarts = 0
+        self._db = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending = set()
+
+    async def start(self, db):
+        """Begin listening; returns once the listener is set up"""
+        if self.mode == "none":
+            return
+        self._db = db
+        mode = self.mode
+        if mode in ("auto", "change_streams"):
+            try:
+                stream = db.watch(self._change_stream_pipeline(), max_await_time_ms=10)
+                await stream.try_next()
+                await stream.close()
+            except OperationFailure as e:
+                if mode == "change_streams" or e.code != CHANGE_STREAMS_UNSUPPORTED:
+                    raise
+                logger.info("Change streams unavailable, using the %s capped collection", self.channel)
+                mode = "capped"
+            else:
+                mode = "change_streams"
+        if mode == "capped":
+            await self._ensure_channel()
+        self.active_mode = mode
+        listen = self._watch_changes if mode == "change_streams" else self._tail_channel
+        self._task = asyncio.create_task(listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def publish(self, collection_name: str):
+        """Tell the other workers a collection changed; a no-op unless tailing the capped channel"""
+        if self.active_mode != "capped":
+            return
+        task = asyncio.get_running_loop().create_task(self._db[self.channel].insert_one(
+            {"collection": collection_name, "origin": self.origin}
+        ))
+        self._pending.add(task)
+        task.add_done_callback(self._published)
+
+    def _published(self, task: asyncio.Task):
+        self._pending.discard(task)
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.error("Failed to publish a cache invalidation", exc_info=task.exception())
+        else:
+            self.published += 1
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "active_mode": self.active_mode,
+            "received": self.received,
+            "published": self.published,
+            "restarts": self.restarts,
+        }
+
+    def _change_stream_pipeline(self) -> list:
+        return [{"$match": {"ns.coll": {"$in": list(self.collections)}}}]
+
+    def _invalidate_all(self):
+        for collection_name in self.collections:
+            self.on_change(collection_name)
+
+    def _deliver(self, collection_name: str):
+        self.received += 1
+        self.on_change(collection_name)
+
+    async def _watch_changes(self):
+        resume_after = None
+        while True:
+            try:
+                async with self._db.watch(self._change_stream_pipeline(), resume_after=resume_after) as stream:
+                    async for change in stream:
+                        resume_after = stream.resume_token
+                        self._deliver(change['ns']['coll'])
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError:
+                logger.exception("Cache invalidation change stream failed; restarting")
+                resume_after = None
+            self.restarts += 1
+            self._invalidate_all()
+            await asyncio.sleep(RETRY_SECONDS)
+
+    async def _ensure_channel(self):
+        try:
+            await self._db.create_collection(self.channel, capped=True, size=self.channel_size)
+        except CollectionInvalid:
+            pass
+        # A tailable cursor on an empty capped collection dies at once, so keep one document in it
+        await self._db[self.channel].insert_one({"collection": None, "origin": self.origin})
+
+    async def _tail_channel(self):
+        channel = self._db[self.channel]
+        while True:
+            try:
+                # Notices before the newest one were published while this worker was not tailing
+                newest = await channel.find({}, {"_id": 1}).sort("$natural", -1).limit(1).to_list(1)
+                marker = newest[0]['_id'] if newest else None
+                self._invalidate_all()
+                cursor = channel.find({}, cursor_type=CursorType.TAILABLE_AWAIT)
+                caught_up = marker is None
+                try:
+                    # Iteration ends whenever a getMore comes back empty on an idle channel, but the
+                    # cursor stays alive and picks up where it left off; only a dead cursor restarts
+                    while cursor.alive:
+                        async for notice in cursor:
+                            if not caught_up:
+                                caught_up = notice['_id'] == marker
+                                continue
+                            if notice['collection'] and notice['origin'] != self.origin:
+                                self._deliver(notice['collection'])
+                        await asyncio.sleep(IDLE_POLL_SECONDS)
+                finally:
+                    await cursor.close()
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError:
+                logger.exception("Cache invalidation channel tailing failed; restarting")
+            self.restarts += 1
+            await asyncio.sleep(RETRY_SECONDS)
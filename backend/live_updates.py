@@ -0,0 +1,177 @@
+"""Server-sent live updates fed by a MongoDB change stream.
+
+``LiveUpdates`` keeps one change stream per worker, opened when the first client
+subscribes, and fans the deltas built from it out to a bounded queue per client. A
+client that falls too far behind is sent a ``resync`` event instead of the deltas it
+missed, and so is every client after the change stream had to be reopened; a ``resync``
+tells the client to refetch what it shows.
+
+Change streams need a replica set or sharded cluster. On a standalone mongod
+``subscribe`` raises ``LiveUpdatesUnavailable`` and clients keep refetching after their
+own writes.
+"""
+import asyncio
+import logging
+from typing import AsyncIterator, Callable, Iterable, Optional, Set
+
+import orjson
+from pymongo.errors import OperationFailure, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# "The $changeStream stage is only supported on replica sets"
+CHANGE_STREAMS_UNSUPPORTED = 40573
+RETRY_SECONDS = 1.0
+RESYNC = {"type": "resync"}
+
+
+class LiveUpdatesUnavailable(Exception):
+    pass
+
+
+def sse_message(event: dict) -> bytes:
+    return b"event: " + event["type"].encode() + b"\ndata: " + orjson.dumps(event) + b"\n\n"
+
+
+class LiveUpdates:
+    def __init__(self, collections: Iterable[str], to_events: Callable[[dict], Iterable[dict]],
+                 queue_size: int = 256, full_document_before_change: Optional[str] = "whenAvailable"):
+        self.collections = tuple(collections)
+        self.to_events = to_events
+        self.queue_size = queue_size
+        self.full_document_before_change = full_document_before_change
+        self.delivered = self.dropped = self.restarts = 0
+        self._clients: Set[asyncio.Queue] = set()
+        self._db = None
+        self._task: Optional[asyncio.Task] = None
+        self._starting: Optional[asyncio.Future] = None
+        self._unavailable: Optional[str] = None
+
+    async def subscribe(self, db) -> asyncio.Queue:
+        """Register a client, opening the change stream for the first one"""
+        if self._task is None:
+            await self._start(db)
+        queue = asyncio.Queue(self.queue_size)
+        self._clients.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._clients.discard(queue)
+
+    def broadcast(self, event: dict):
+        for queue in list(self._clients):
+            try:
+                queue.put_nowait(event)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                # Too far behind to catch up from deltas; tell it to refetch instead
+                self.dropped += 1
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "clients": len(self._clients),
+            "running": self._task is not None,
+            "unavailable": self._unavailable,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "restarts": self.restarts,
+        }
+
+    async def _start(self, db):
+        if self._unavailable:
+            raise LiveUpdatesUnavailable(self._unavailable)
+        # Concurrent first subscribers share one attempt to open the stream
+        if self._starting is not None:
+            await asyncio.shield(self._starting)
+            return
+        self._starting = asyncio.get_running_loop().create_future()
+        try:
+            self._db = db
+            stream = await self._open(None)
+            self._task = asyncio.create_task(self._run(stream))
+            self._starting.set_result(None)
+        except BaseException as e:
+            self._starting.set_exception(e)
+            self._starting.exception()  # Mark retrieved; waiters re-raise it themselves
+            raise
+        finally:
+            self._starting = None
+
+    async def _open(self, resume_after):
+        options = {"full_document": "updateLookup", "resume_after": resume_after}
+        if self.full_document_before_change:
+            options["full_document_before_change"] = self.full_document_before_change
+        stream = self._db.watch([{"$match": {"ns.coll": {"$in": list(self.collections)}}}], **options)
+        try:
+            # Opening the stream is what fails on a standalone server or an unknown option
+            change = await stream.try_next()
+        except OperationFailure as e:
+            await stream.close()
+            if e.code == CHANGE_STREAMS_UNSUPPORTED:
+                self._unavailable = "Live updates need MongoDB change streams (a replica set)"
+                raise LiveUpdatesUnavailable(self._unavailable) from e
+            if self.full_document_before_change:
+                # Before MongoDB 6.0 there are no pre-images; deletes then arrive without an id
+                logger.warning("Change stream pre-images unavailable: %s", e)
+                self.full_document_before_change = None
+                return await self._open(resume_after)
+            raise
+        if change is not None:
+            self._dispatch(change)
+        return stream
+
+    def _dispatch(self, change: dict):
+        try:
+            for event in self.to_events(change):
+                self.broadcast(event)
+        except Exception:
+            logger.exception("Failed to build live update from a %s change", change.get('operationType'))
+
+    async def _run(self, stream):
+        while True:
+            try:
+                async with stream:
+                    async for change in stream:
+                        self._dispatch(change)
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError:
+                logger.exception("Live updates change stream failed; reopening")
+            resume_after = stream.resume_token
+            await asyncio.sleep(RETRY_SECONDS)
+            self.restarts += 1
+            while True:
+                try:
+                    stream = await self._open(resume_after)
+                    break
+                except PyMongoError:
+                    # The resume point may have rolled off the oplog; start from now instead
+                    logger.exception("Could not reopen the live updates change stream")
+                    resume_after = None
+                    await asyncio.sleep(RETRY_SECONDS)
+            if resume_after is None:
+                self.broadcast(RESYNC)
+
+
+async def event_stream(queue: asyncio.Queue, heartbeat_seconds: float) -> AsyncIterator[bytes]:
+    """Encode a client's queue as server-sent events, with comment heartbeats when idle"""
+    yield b"retry: 3000\n\n"
+    while True:
+        try:
+            event = await asyncio.wait_for(queue.get(), heartbeat_seconds)
+        except asyncio.TimeoutError:
+            yield b": keepalive\n\n"
+            continue
+        yield sse_message(event)
@@ -0,0 +1,95 @@
+"""Maintenance commands for the Clay Tracker Australia backend.
+
+Run from the backend directory, e.g. ``python manage.py rebuild-stats``.
+"""
+import asyncio
+import json
+import os
+import tempfile
+
+import typer
+
+import server
+
+cli = typer.Typer(help="Clay Tracker Australia maintenance commands")
+
+
+def run(coroutine):
+    """Run a maintenance coroutine with a Mongo client of its own"""
+    server.connect_mongo()
+    try:
+        return asyncio.run(coroutine)
+    finally:
+        server.close_mongo()
+
+
+@cli.command("ensure-indexes")
+def ensure_indexes():
+    """Create the indexes the API relies on, for servers started with ENSURE_INDEXES_ON_STARTUP=false."""
+    async def provision():
+        await server.ensure_indexes()
+        await server.enable_change_stream_pre_images()
+    run(provision())
+    typer.echo("Indexes ready")
+
+
+@cli.command("rebuild-stats")
+def rebuild_stats():
+    """Backfill the session_stats rollup from a full recompute."""
+    rollup = run(server.rebuild_stats_rollup())
+    typer.echo(json.dumps(rollup, indent=2, default=str))
+
+
+@cli.command("backfill-accuracy")
+def backfill_accuracy():
+    """Store the accuracy field on sessions created before it existed."""
+    modified = run(server.backfill_session_accuracy())
+    typer.echo(f"Backfilled accuracy on {modified} sessions")
+
+
+@cli.command("reconcile-fixtures")
+def reconcile_fixtures():
+    """Repair stale fixture names and clear links to deleted fixtures (whatever FIXTURE_DELETE_POLICY says)."""
+    report = run(server.reconcile_fixture_links())
+    typer.echo(json.dumps(report, indent=2))
+
+
+@cli.command("migrate-dates")
+def migrate_dates(batch_size: int = typer.Option(server.DATE_MIGRATION_BATCH_SIZE, help="Documents per batch")):
+    """Convert session and fixture dates stored as ISO strings to BSON dates."""
+    async def migrate():
+        return {
+            name: await server.migrate_dates(name, batch_size)
+            for name in ("shooting_sessions", "fixtures")
+        }
+    for name, migrated in run(migrate()).items():
+        typer.echo(f"Migrated dates on {migrated} {name} documents")
+
+
+@cli.command("check-stats")
+def check_stats():
+    """Compare the session_stats rollup against a full recompute."""
+    report = run(server.check_stats_rollup())
+    typer.echo(json.dumps(report, indent=2, default=str))
+    if not report['consistent']:
+        raise typer.Exit(code=1)
+
+
+@cli.command("serve")
+def serve(host: str = "0.0.0.0", port: int = 8001,
+          workers: int = typer.Option(1, help="Worker processes, each with its own Mongo client and caches")):
+    """Run the API with uvicorn, optionally across several worker processes.
+
+    With more than one worker Prometheus metrics are aggregated through
+    PROMETHEUS_MULTIPROC_DIR; the cache invalidation bus defaults to "auto" regardless.
+    """
+    import uvicorn
+
+    if workers > 1:
+        if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+            os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="clay-tracker-metrics-")
+    uvicorn.run("server:app", host=host, port=port, workers=workers)
+
+
+if __name__ == "__main__":
+    cli()
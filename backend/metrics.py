@@ -0,0 +1,205 @@
+"""Prometheus metrics for the API.
+
+``MetricsMiddleware`` records per-route latency, request and response sizes and
+in-flight requests. ``MongoCommandMetrics`` is a pymongo ``CommandListener`` that
+records Mongo latency per collection and command. Time inside a request is also split
+into phases: Mongo commands are credited to the request that issued them, and code
+wrapped in ``phase_timer`` (Pydantic validation, JSON encoding) adds its own phase, so
+``app_request_phase_seconds`` shows where a route such as /api/stats spends its time.
+Commands that run concurrently (``asyncio.gather``) each count in full, so the mongo
+phase can exceed the request's wall time.
+
+With several workers, set PROMETHEUS_MULTIPROC_DIR to an empty directory before the
+workers start; each worker then writes its samples there and /metrics aggregates them.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+from pymongo import monitoring
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Requests that matched no route share one label so unknown paths cannot blow up cardinality
+UNMATCHED_ROUTE = "unmatched"
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time to serve a request, including streaming the body",
+    ("method", "route", "status"), buckets=LATENCY_BUCKETS,
+)
+REQUEST_SIZE = Histogram(
+    "http_request_size_bytes", "Request body size", ("method", "route"), buckets=SIZE_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Response body size as sent, after compression",
+    ("method", "route"), buckets=SIZE_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests currently being served", ("method",),
+    multiprocess_mode="livesum",
+)
+REQUEST_PHASE = Histogram(
+    "app_request_phase_seconds", "Time a request spent in each phase",
+    ("route", "phase"), buckets=LATENCY_BUCKETS,
+)
+MONGO_COMMAND_LATENCY = Histogram(
+    "mongodb_command_duration_seconds", "Mongo command latency as seen by the driver",
+    ("collection", "command"), buckets=LATENCY_BUCKETS,
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "mongodb_command_failures_total", "Mongo commands that returned an error",
+    ("collection", "command"),
+)
+
+# Phase timings of the current request. Motor copies the context onto its executor
+# threads, so the command listener sees the list of the request that issued a command
+_request_phases: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_phases", default=None)
+
+
+def record_phase(phase: str, seconds: float):
+    phases = _request_phases.get()
+    if phases is not None:
+        phases.append((phase, seconds))  # list.append is atomic, so executor threads may call this
+
+
+@contextmanager
+def phase_timer(phase: str):
+    """Credit the time spent in the block to ``phase`` of the current request"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, time.perf_counter() - started)
+
+
+def metrics_response_body() -> Tuple[bytes, str]:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_worker_stopped():
+    """Drop this worker's live gauges from the multiprocess aggregate when it exits"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def is_event_stream(message: Message) -> bool:
+    """Whether an http.response.start message begins a server-sent events stream"""
+    for name, value in message.get("headers", ()):
+        if name.lower() == b"content-type":
+            return value.split(b";")[0].strip().lower() == b"text/event-stream"
+    return False
+
+
+def _route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Record latency, sizes, in-flight requests and phase timings for HTTP requests.
+
+    Server-sent event streams stay open for as long as the client is connected, so they
+    leave the in-flight gauge once their headers are sent and are not observed at all.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        request_size = 0
+        response_size = 0
+        status = 500
+        streaming = False
+
+        async def receive_wrapper() -> Message:
+            nonlocal request_size
+            message = await receive()
+            if message["type"] == "http.request":
+                request_size += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message):
+            nonlocal response_size, status, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if is_event_stream(message):
+                    streaming = True
+                    in_flight.dec()
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        phases: List[Tuple[str, float]] = []
+        token = _request_phases.set(phases)
+        in_flight = REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_phases.reset(token)
+            if not streaming:
+                in_flight.dec()
+                # The router stores the matched route in the scope, so the label is the path template
+                route = _route_label(scope)
+                REQUEST_LATENCY.labels(method, route, str(status)).observe(elapsed)
+                REQUEST_SIZE.labels(method, route).observe(request_size)
+                RESPONSE_SIZE.labels(method, route).observe(response_size)
+                totals = {}
+                for phase, seconds in phases:
+                    totals[phase] = totals.get(phase, 0.0) + seconds
+                for phase, seconds in totals.items():
+                    REQUEST_PHASE.labels(route, phase).observe(seconds)
+
+
+def command_collection(event) -> str:
+    """The collection a command targets, or an empty string for database-level commands"""
+    if event.command_name == "getMore":
+        return event.command.get("collection", "")
+    target = event.command.get(event.command_name)
+    return target if isinstance(target, str) else ""
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Per-collection, per-command Mongo latency, also credited to the issuing request"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Reply events carry no command document, so remember each command's collection
+        self._collections = {}
+
+    def started(self, event):
+        with self._lock:
+            self._collections[(event.connection_id, event.request_id)] = command_collection(event)
+
+    def _finished(self, event) -> str:
+        with self._lock:
+            collection = self._collections.pop((event.connection_id, event.request_id), "")
+        seconds = event.duration_micros / 1e6
+        MONGO_COMMAND_LATENCY.labels(collection, event.command_name).observe(seconds)
+        record_phase("mongo", seconds)
+        return collection
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        collection = self._finished(event)
+        MONGO_COMMAND_FAILURES.labels(collection, event.command_name).inc()
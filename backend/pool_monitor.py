@@ -0,0 +1,141 @@
+"""Connection pool monitoring for the Motor client.
+
+``PoolMonitor`` is a pymongo ``ConnectionPoolListener``: pass it in ``event_listeners``
+when creating the client and it tracks, per server, how many connections are open and
+checked out, how many operations are waiting for one, and how long checkouts wait.
+Long checkout waits with every connection in use mean requests are queueing on the
+pool rather than on the server.
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from pymongo import monitoring
+
+WAIT_SAMPLES = 1024
+
+
+def percentile(samples: list, fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of already sorted samples"""
+    if not samples:
+        return None
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+class _PoolStats:
+    def __init__(self):
+        self.open = 0
+        self.in_use = 0
+        self.waiting = 0
+        self.checkouts = 0
+        self.checkout_failures: Dict[str, int] = {}
+        self.clears = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.waits = deque(maxlen=WAIT_SAMPLES)
+
+    def snapshot(self) -> dict:
+        waits = sorted(self.waits)
+        to_ms = lambda seconds: None if seconds is None else round(seconds * 1000, 3)
+        return {
+            "open": self.open,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "checkouts": self.checkouts,
+            "checkout_failures": dict(self.checkout_failures),
+            "clears": self.clears,
+            "wait_ms": {
+                "mean": to_ms(self.wait_total / self.checkouts) if self.checkouts else None,
+                "max": to_ms(self.wait_max),
+                "p50": to_ms(percentile(waits, 0.50)),
+                "p95": to_ms(percentile(waits, 0.95)),
+                "p99": to_ms(percentile(waits, 0.99)),
+            },
+        }
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Open/in-use counts and checkout wait times for each connection pool.
+
+    Motor runs pymongo operations on executor threads, so a checkout's started and
+    checked-out events arrive on the same thread and are paired through a thread local.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: Dict[str, _PoolStats] = {}
+        self._local = threading.local()
+
+    def _pool(self, address) -> _PoolStats:
+        key = "%s:%s" % address
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _PoolStats()
+        return pool
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {address: pool.snapshot() for address, pool in self._pools.items()}
+
+    def pool_created(self, event):
+        with self._lock:
+            self._pool(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._pool(event.address).clears += 1
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._pools.pop("%s:%s" % event.address, None)
+
+    def connection_created(self, event):
+        with self._lock:
+            self._pool(event.address).open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.open = max(0, pool.open - 1)
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+        with self._lock:
+            self._pool(event.address).waiting += 1
+
+    def connection_check_out_failed(self, event):
+        self._local.started = None
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.waiting = max(0, pool.waiting - 1)
+            reason = str(event.reason)
+            pool.checkout_failures[reason] = pool.checkout_failures.get(reason, 0) + 1
+
+    def connection_checked_out(self, event):
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        # pymongo 4.7+ reports the wait itself
+        wait = getattr(event, "duration", None)
+        if wait is None and started is not None:
+            wait = time.perf_counter() - started
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.waiting = max(0, pool.waiting - 1)
+            pool.in_use += 1
+            pool.checkouts += 1
+            if wait is not None:
+                pool.wait_total += wait
+                pool.wait_max = max(pool.wait_max, wait)
+                pool.waits.append(wait)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.in_use = max(0, pool.in_use - 1)
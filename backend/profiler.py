@@ -0,0 +1,241 @@
+"""Opt-in wall-clock sampling profiler for slow requests.
+
+While ``ProfilerMiddleware`` is installed, a sampler thread walks the stack of every
+in-flight request at a fixed interval: the chain of awaiting coroutines of the request's
+task, plus the synchronous frames below it when the task is the one running. Time spent
+awaiting Mongo therefore shows up as samples parked at the await, next to CPU time in
+Pydantic or JSON encoding.
+
+A finished request keeps its profile when it took at least ``threshold_seconds`` or was
+picked by ``sample_rate``. The last ``max_profiles`` are kept in a ring buffer and can be
+rendered as collapsed stacks (flamegraph.pl, speedscope) or speedscope JSON. Server-sent
+event streams stay open for as long as the client is connected, so they stop being
+sampled once their headers are sent and their profiles are never kept. Without the
+middleware there is no sampler thread and no per-request cost.
+"""
+import asyncio
+import itertools
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from metrics import is_event_stream
+
+# A frame is identified by (qualified name, file, first line of the function)
+FrameKey = Tuple[str, str, int]
+
+
+def _frame_key(frame) -> FrameKey:
+    code = frame.f_code
+    return (getattr(code, "co_qualname", code.co_name), code.co_filename, code.co_firstlineno)
+
+
+def _awaitable_frame(awaitable):
+    return getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None) or getattr(awaitable, "ag_frame", None)
+
+
+def _awaited(awaitable):
+    return getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None) or getattr(awaitable, "ag_await", None)
+
+
+def task_stack(task: asyncio.Task, thread_frame=None) -> Tuple[FrameKey, ...]:
+    """Stack of a task, outermost first.
+
+    ``thread_frame`` is the current frame of the event loop thread; when the task is
+    running it holds the synchronous calls below the innermost coroutine.
+    """
+    frames = []
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        frame = _awaitable_frame(awaitable)
+        if frame is None:
+            # Parked on a future or another non-coroutine awaitable
+            frames.append((f"<await {type(awaitable).__name__}>", "", 0))
+            break
+        frames.append(frame)
+        awaitable = _awaited(awaitable)
+
+    if frames and thread_frame is not None and not isinstance(frames[-1], tuple):
+        innermost = frames[-1]
+        below = []
+        frame = thread_frame
+        while frame is not None and frame is not innermost:
+            below.append(frame)
+            frame = frame.f_back
+        if frame is innermost:
+            frames.extend(reversed(below))
+
+    return tuple(frame if isinstance(frame, tuple) else _frame_key(frame) for frame in frames)
+
+
+class Profile:
+    def __init__(self, profile_id: int, method: str, path: str, started_at: datetime):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.started_at = started_at
+        self.started = time.perf_counter()
+        self.status: Optional[int] = None
+        self.duration = 0.0
+        self.samples: Counter = Counter()
+        # Wall time each stack stood for; samples can land late while the loop holds the GIL
+        self.weights: Counter = Counter()
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 3),
+            "samples": sum(self.samples.values()),
+            "sampled_ms": round(sum(self.weights.values()) * 1000, 3),
+        }
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed stack format, one ``frame;frame;frame count`` line per stack"""
+        lines = []
+        for stack, count in self.samples.most_common():
+            names = ";".join(f"{name} ({filename}:{line})" if filename else name for name, filename, line in stack)
+            lines.append(f"{names} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self) -> dict:
+        """A speedscope sampled profile, weighted by the wall time between samples"""
+        index: Dict[FrameKey, int] = {}
+        frames, samples, weights = [], [], []
+        for stack in list(self.samples):
+            indices = []
+            for key in stack:
+                if key not in index:
+                    index[key] = len(frames)
+                    name, filename, line = key
+                    frames.append({"name": name, "file": filename, "line": line} if filename else {"name": name})
+                indices.append(index[key])
+            samples.append(indices)
+            weights.append(self.weights[stack])
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.method} {self.path}",
+            "exporter": "clay-tracker profiler",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": f"{self.method} {self.path} ({self.duration * 1000:.1f} ms)",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.duration,
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+
+class ProfileStore:
+    """Ring buffer of the most recent kept profiles"""
+
+    def __init__(self, max_profiles: int = 50):
+        self._profiles = deque(maxlen=max_profiles)
+        self._lock = threading.Lock()
+
+    def add(self, profile: Profile):
+        with self._lock:
+            self._profiles.append(profile)
+
+    def list(self) -> List[Profile]:
+        with self._lock:
+            return list(reversed(self._profiles))
+
+    def get(self, profile_id: int) -> Optional[Profile]:
+        with self._lock:
+            return next((profile for profile in self._profiles if profile.id == profile_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+
+class ProfilerMiddleware:
+    """Sample the stacks of in-flight requests and keep the profiles of slow or sampled ones"""
+
+    def __init__(self, app: ASGIApp, store: ProfileStore, threshold_seconds: float = 1.0,
+                 sample_rate: float = 0.0, interval: float = 0.005):
+        self.app = app
+        self.store = store
+        self.threshold_seconds = threshold_seconds
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self._ids = itertools.count(1)
+        self._active: Dict[int, Tuple[asyncio.Task, Profile]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._loop_thread: Optional[int] = None
+        self._sampler: Optional[threading.Thread] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self._ensure_sampler()
+        profile = Profile(next(self._ids), scope["method"], scope["path"], datetime.now(timezone.utc))
+        keep_sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+
+        streaming = False
+
+        async def send_wrapper(message: Message):
+            nonlocal streaming
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                if is_event_stream(message):
+                    streaming = True
+                    with self._lock:
+                        self._active.pop(profile.id, None)
+            await send(message)
+
+        with self._lock:
+            self._active[profile.id] = (asyncio.current_task(), profile)
+        self._wake.set()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.duration = time.perf_counter() - profile.started
+            with self._lock:
+                self._active.pop(profile.id, None)
+            if not streaming and (keep_sampled or profile.duration >= self.threshold_seconds):
+                self.store.add(profile)
+
+    def _ensure_sampler(self):
+        if self._sampler is None:
+            self._loop_thread = threading.get_ident()
+            self._sampler = threading.Thread(target=self._run_sampler, name="request-profiler", daemon=True)
+            self._sampler.start()
+
+    def _run_sampler(self):
+        last_sample = time.perf_counter()
+        while True:
+            with self._lock:
+                active = list(self._active.values())
+                if not active:
+                    self._wake.clear()
+            if not active:
+                self._wake.wait()
+                last_sample = time.perf_counter()
+                continue
+            now = time.perf_counter()
+            thread_frame = sys._current_frames().get(self._loop_thread)
+            for task, profile in active:
+                # A task that finished between the snapshot and this walk has no coroutine stack
+                if not task.done():
+                    stack = task_stack(task, thread_frame)
+                    profile.samples[stack] += 1
+                    profile.weights[stack] += now - max(last_sample, profile.started)
+            last_sample = now
+            time.sleep(self.interval)
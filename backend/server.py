@@ -1,28 +1,110 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+import time
+# Taken before the other imports so the startup report covers them
+IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query, Request, Response
 from dotenv import load_dotenv
+from fastapi.responses import StreamingResponse
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo.read_preferences import make_read_preference, read_pref_mode_from_name
 import os
+import re
+import asyncio
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, ValidationError
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 import uuid
-from datetime import datetime, date
+import json
+import base64
+import csv
+import io
+import binascii
+import heapq
+import itertools
+import hashlib
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlencode
+import orjson
+from datetime import datetime, date, timedelta
 from enum import Enum
 
+from compression import CompressionMiddleware, compress, negotiate_encoding, weaken_etag
+from pool_monitor import PoolMonitor
+from metrics import MetricsMiddleware, MongoCommandMetrics, mark_worker_stopped, metrics_response_body, phase_timer
+from profiler import ProfilerMiddleware, ProfileStore
+from invalidation import InvalidationBus
+from live_updates import RESYNC, LiveUpdates, LiveUpdatesUnavailable, event_stream
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# MongoDB connection. MONGO_URL and DB_NAME are read when connecting; pool sizing, wire
+# compression and timeouts come from the environment too, and compressors are a
+# comma-separated list such as "zstd,zlib" (empty disables compression)
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '0'))
+MONGO_COMPRESSORS = os.environ.get('MONGO_COMPRESSORS', '')
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', '30000'))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '10000'))
+# Exports are uncached one-off reads that tolerate replication lag, so they may go to
+# secondaries. Cached endpoints must not: a lagging secondary's pre-write body would be cached
+# and ETagged under the post-write version
+MONGO_ANALYTICS_READ_PREFERENCE = os.environ.get('MONGO_ANALYTICS_READ_PREFERENCE', 'secondaryPreferred')
+
+def mongo_client_options() -> dict:
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    }
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    return options
+
+pool_monitor = PoolMonitor()
+
+# The client is created per process by connect_mongo() at startup rather than at import, so
+# workers forked from a process that imported the app never share a client's sockets or threads
+client: Optional["AsyncIOMotorClient"] = None
+db = None
+analytics_db = None
 
-# Create the main app without a prefix
-app = FastAPI()
+def connect_mongo():
+    global client, db, analytics_db
+    if client is not None:
+        return
+    # Motor is imported here rather than at module level: it is the slowest import after
+    # FastAPI itself, and tools that import this module without connecting skip it
+    from motor.motor_asyncio import AsyncIOMotorClient
 
-# Create a router with the /api prefix
+    client = AsyncIOMotorClient(
+        os.environ['MONGO_URL'], event_listeners=[pool_monitor, MongoCommandMetrics()], **mongo_client_options()
+    )
+    db = client[os.environ['DB_NAME']]
+    analytics_db = client.get_database(
+        os.environ['DB_NAME'],
+        read_preference=make_read_preference(read_pref_mode_from_name(MONGO_ANALYTICS_READ_PREFERENCE), None),
+    )
+
+def close_mongo():
+    global client, db, analytics_db
+    if client is not None:
+        client.close()
+    client = db = analytics_db = None
+
+# Create a router with the /api prefix; create_app() mounts it on the app
 api_router = APIRouter(prefix="/api")
 
 # Enums
@@ -41,6 +123,23 @@ class WeatherCondition(str, Enum):
     RAINY = "rainy"
     OVERCAST = "overcast"
 
+class SessionSortField(str, Enum):
+    DATE = "date"
+    ACCURACY = "accuracy"
+    CLAYS_HIT = "clays_hit"
+    TOTAL_CLAYS = "total_clays"
+    LOCATION = "location"
+    DISCIPLINE = "discipline"
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+class FixtureDeletePolicy(str, Enum):
+    NULLIFY = "nullify"  # Keep the sessions, clear their fixture link
+    DELETE = "delete"  # Delete the fixture's sessions too
+    BLOCK = "block"  # Refuse while sessions still reference the fixture
+
 # Models
 class Fixture(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -100,6 +199,7 @@ class ShootingSession(BaseModel):
     notes: Optional[str] = None
     fixture_id: Optional[str] = None  # Link to fixture if session is part of a fixture
     fixture_name: Optional[str] = None  # Denormalized fixture name for easy display
+    accuracy: Optional[float] = None  # Stored hit percentage so accuracy filters and sorts can use an index
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 class ShootingSessionCreate(BaseModel):
@@ -145,49 +245,1412 @@ class SessionStats(BaseModel):
     current_streak: int
     favorite_discipline: str
 
-# Routes
-@api_router.get("/")
-async def root():
-    return {"message": "Clay Tracker Australia - Shooting Performance API"}
+class SeriesBucketSize(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
 
-@api_router.post("/sessions", response_model=ShootingSession)
-async def create_session(session_data: ShootingSessionCreate):
+class SeriesTotals(BaseModel):
+    sessions: int
+    total_clays: int
+    clays_hit: int
+    accuracy: float
+
+class DisciplineSeries(SeriesTotals):
+    discipline: str
+
+class SeriesPoint(SeriesTotals):
+    bucket: str  # First day of the bucket (YYYY-MM-DD)
+    disciplines: List[DisciplineSeries]
+
+class PerformanceSeries(BaseModel):
+    bucket: SeriesBucketSize
+    points: List[SeriesPoint]
+    disciplines: List[DisciplineSeries]  # Totals per discipline across the whole filtered range
+
+class BulkRowResult(BaseModel):
+    index: int
+    status: str  # "created" or "error"
+    id: Optional[str] = None
+    errors: Optional[List[str]] = None
+
+class BulkImportResult(BaseModel):
+    total: int
+    created: int
+    failed: int
+    results: List[BulkRowResult]
+
+# Statistics
+STREAK_ACCURACY_THRESHOLD = 80  # Minimum session accuracy (%) that extends the current streak
+STREAK_BATCH_SIZE = 32
+
+# Materialized rollup of session totals, kept current by the session write handlers
+STATS_ROLLUP_ID = "sessions"
+STATS_FIELDS = ('total_clays', 'clays_hit', 'discipline')
+
+SESSION_ACCURACY_EXPR = {"$cond": [
+    {"$gt": ["$total_clays", 0]},
+    {"$multiply": [{"$divide": ["$clays_hit", "$total_clays"]}, 100]},
+    0,
+]}
+
+# Totals, best session accuracy and discipline counts in a single round trip
+STATS_PIPELINE = [
+    {"$facet": {
+        "totals": [
+            {"$group": {
+                "_id": None,
+                "total_sessions": {"$sum": 1},
+                "total_clays": {"$sum": "$total_clays"},
+                "total_hits": {"$sum": "$clays_hit"},
+                "best_accuracy": {"$max": SESSION_ACCURACY_EXPR},
+            }},
+        ],
+        "disciplines": [
+            {"$group": {"_id": "$discipline", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+        ],
+    }},
+]
+
+def session_accuracy(session: dict) -> float:
+    """Accuracy (%) of a stored session, matching SESSION_ACCURACY_EXPR"""
+    if session['total_clays'] > 0:
+        return session['clays_hit'] / session['total_clays'] * 100
+    return 0
+
+def _stats_delta(session: dict, sign: int, inc: Optional[dict] = None) -> dict:
+    """Accumulate the rollup $inc contribution of a session (sign=1 to add, -1 to remove)"""
+    inc = {} if inc is None else inc
+    contributions = {
+        "total_sessions": 1,
+        "total_clays": session['total_clays'],
+        "total_hits": session['clays_hit'],
+        f"disciplines.{DisciplineType(session['discipline']).value}": 1,
+    }
+    for field, value in contributions.items():
+        inc[field] = inc.get(field, 0) + sign * value
+    return inc
+
+async def recompute_stats_rollup() -> dict:
+    """Recompute the stats rollup from a full scan of shooting_sessions"""
+    facets = await db.shooting_sessions.aggregate(STATS_PIPELINE).to_list(1)
+    totals = facets[0]['totals'][0] if facets and facets[0]['totals'] else {}
+    return {
+        "_id": STATS_ROLLUP_ID,
+        "total_sessions": totals.get('total_sessions', 0),
+        "total_clays": totals.get('total_clays', 0),
+        "total_hits": totals.get('total_hits', 0),
+        "best_session_accuracy": totals.get('best_accuracy', 0),
+        "disciplines": {d['_id']: d['count'] for d in facets[0]['disciplines']} if facets else {},
+    }
+
+async def rebuild_stats_rollup() -> dict:
+    """Backfill (or overwrite) the stats rollup from a full recompute"""
+    rollup = await recompute_stats_rollup()
+    await db.session_stats.replace_one({"_id": STATS_ROLLUP_ID}, rollup, upsert=True)
+    await collection_changed("session_stats")
+    logger.info("Rebuilt stats rollup from %d sessions", rollup['total_sessions'])
+    return rollup
+
+async def check_stats_rollup() -> dict:
+    """Compare the stored stats rollup against a full recompute"""
+    stored = await db.session_stats.find_one({"_id": STATS_ROLLUP_ID}) or {}
+    expected = await recompute_stats_rollup()
+    differences = {}
+    for field in ('total_sessions', 'total_clays', 'total_hits'):
+        if stored.get(field) != expected[field]:
+            differences[field] = {"rollup": stored.get(field), "recomputed": expected[field]}
+    if abs(stored.get('best_session_accuracy', -1) - expected['best_session_accuracy']) > 1e-9:
+        differences['best_session_accuracy'] = {
+            "rollup": stored.get('best_session_accuracy'),
+            "recomputed": expected['best_session_accuracy'],
+        }
+    stored_disciplines = {d: n for d, n in stored.get('disciplines', {}).items() if n}
+    if stored_disciplines != expected['disciplines']:
+        differences['disciplines'] = {"rollup": stored_disciplines, "recomputed": expected['disciplines']}
+    return {"consistent": not differences and bool(stored), "missing": not stored, "differences": differences}
+
+async def apply_stats_delta(inc: dict, added_accuracy: Optional[float] = None,
+                            removed_accuracy: Optional[float] = None):
+    """Atomically apply a session write to the stats rollup.
+
+    Counters are adjusted with $inc and the best accuracy only ever rises via $max.
+    When the removed session may have held the best accuracy, the best is recomputed
+    and written back only if no concurrent write has changed it in the meantime.
+    A missing rollup is left alone; it is rebuilt on the next read.
+    """
+    update = {"$inc": {field: value for field, value in inc.items() if value}}
+    if added_accuracy is not None:
+        update["$max"] = {"best_session_accuracy": added_accuracy}
+    if not update["$inc"]:
+        del update["$inc"]
+    if not update:
+        return
+    rollup = await db.session_stats.find_one_and_update(
+        {"_id": STATS_ROLLUP_ID}, update, return_document=ReturnDocument.AFTER
+    )
+    if rollup is None or removed_accuracy is None:
+        return
+    best = rollup.get('best_session_accuracy', 0)
+    if removed_accuracy >= best:
+        await db.session_stats.update_one(
+            {"_id": STATS_ROLLUP_ID, "best_session_accuracy": best},
+            {"$set": {"best_session_accuracy": await best_session_accuracy()}},
+        )
+
+async def best_session_accuracy() -> float:
+    """Highest session accuracy, through the accuracy index once every session stores it.
+
+    Until the accuracy backfill has reached every session, the sessions without the field
+    could hold the best, so it falls back to computing the accuracy of every session.
+    """
+    # Missing accuracy values sit at the null end of the accuracy index
+    if await db.shooting_sessions.find_one({"accuracy": None}, {"_id": 1}) is None:
+        top = await db.shooting_sessions.find_one({}, {"_id": 0, "accuracy": 1}, sort=list_sort("accuracy"))
+        return top['accuracy'] if top else 0
+    result = await db.shooting_sessions.aggregate([
+        {"$group": {"_id": None, "best": {"$max": SESSION_ACCURACY_EXPR}}},
+    ]).to_list(1)
+    return result[0]['best'] if result else 0
+
+async def compute_current_streak() -> int:
+    """Count the most recent consecutive sessions at or above the streak threshold.
+
+    Walks a date-sorted cursor and stops at the first session below the threshold,
+    so only the streak itself (plus one document) is read from Mongo.
+    """
+    streak = 0
+    cursor = db.shooting_sessions.find(
+        {}, {"_id": 0, "total_clays": 1, "clays_hit": 1}
+    ).sort([("date", -1), ("created_at", -1)]).batch_size(STREAK_BATCH_SIZE)
+    try:
+        async for session in cursor:
+            if session['total_clays'] > 0:
+                accuracy = (session['clays_hit'] / session['total_clays'] * 100)
+                if accuracy >= STREAK_ACCURACY_THRESHOLD:
+                    streak += 1
+                else:
+                    break
+    finally:
+        await cursor.close()
+    return streak
+
+async def compute_stats() -> SessionStats:
+    """Read session statistics from the rollup, rebuilding it if missing"""
+    rollup, current_streak = await asyncio.gather(
+        db.session_stats.find_one({"_id": STATS_ROLLUP_ID}),
+        compute_current_streak(),
+    )
+    if rollup is None:
+        rollup = await rebuild_stats_rollup()
+
+    if not rollup['total_sessions']:
+        return SessionStats(
+            total_sessions=0,
+            total_clays=0,
+            total_hits=0,
+            overall_accuracy=0.0,
+            best_session_accuracy=0.0,
+            current_streak=0,
+            favorite_discipline=""
+        )
+
+    total_clays = rollup['total_clays']
+    total_hits = rollup['total_hits']
+    overall_accuracy = (total_hits / total_clays * 100) if total_clays > 0 else 0
+    disciplines = [(d, n) for d, n in rollup.get('disciplines', {}).items() if n > 0]
+    favorite_discipline = min(disciplines, key=lambda item: (-item[1], item[0]))[0] if disciplines else ""
+
+    with phase_timer("validate"):
+        return SessionStats(
+            total_sessions=rollup['total_sessions'],
+            total_clays=total_clays,
+            total_hits=total_hits,
+            overall_accuracy=round(overall_accuracy, 1),
+            best_session_accuracy=round(rollup['best_session_accuracy'], 1),
+            current_streak=current_streak,
+            favorite_discipline=favorite_discipline
+        )
+
+# Dates are stored as native BSON dates at midnight UTC (BSON has no date-only type). Reads
+# that return rows format them back to YYYY-MM-DD inside Mongo, so rows need no parsing here.
+# Expressions wrap the date in $toDate, which also accepts the ISO strings of documents not
+# yet migrated; range filters and cursors compare BSON dates and skip those documents until
+# the migration (run in the background at startup, or by "manage.py migrate-dates") reaches them
+DATE_VALUE_EXPR = {"$toDate": "$date"}
+DATE_STRING_EXPR = {"$dateToString": {"format": "%Y-%m-%d", "date": DATE_VALUE_EXPR}}
+DATE_MIGRATION_BATCH_SIZE = 1000
+DATE_MIGRATION_ON_STARTUP = os.environ.get('DATE_MIGRATION_ON_STARTUP', 'true').lower() in ('1', 'true', 'yes')
+
+def to_bson_date(value: date) -> datetime:
+    return datetime(value.year, value.month, value.day)
+
+def as_date(value) -> date:
+    """A stored date as a date, whether it is a BSON date or a legacy ISO string"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    return value
+
+# Keyset pagination: lists are ordered on (sort field, created_at, id), newest first by default,
+# and a page resumes strictly after the last document of the previous one, so page N costs the
+# same as page 1
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def list_sort(sort_field: str = "date", order: SortOrder = SortOrder.DESC) -> list:
+    direction = DESCENDING if order == SortOrder.DESC else ASCENDING
+    return [(sort_field, direction), ("created_at", direction), ("id", direction)]
+
+LIST_SORT = list_sort()
+
+def encode_cursor(document: dict, sort_field: str = "date", order: SortOrder = SortOrder.DESC) -> str:
+    """Build an opaque cursor from the sort key of the last document on a page"""
+    key = [sort_field, order.value, document.get(sort_field), document['created_at'].isoformat(), document['id']]
+    return encode_token(key)
+
+def encode_token(key: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+def decode_token(token: str) -> list:
+    """Decode an opaque cursor; malformed tokens raise ValueError, TypeError or binascii.Error"""
+    return json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+
+def cursor_filter(cursor: str, sort_field: str = "date", order: SortOrder = SortOrder.DESC) -> dict:
+    """Translate a cursor into a range filter selecting the documents after it"""
+    try:
+        cursor_field, cursor_order, last_value, last_created, last_id = decode_token(cursor)
+        last_created = datetime.fromisoformat(last_created)
+        if sort_field == "date":
+            last_value = to_bson_date(date.fromisoformat(last_value))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_field != sort_field or cursor_order != order.value:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort")
+    
+    op = "$lt" if order == SortOrder.DESC else "$gt"
+    clauses = [
+        {sort_field: last_value, "created_at": {op: last_created}},
+        {sort_field: last_value, "created_at": last_created, "id": {op: last_id}},
+    ]
+    # Sessions stored before the accuracy field existed have none until the backfill reaches
+    # them. Missing values sort below every number and range operators never match them, so
+    # the null block is stepped into (descending) or out of (ascending) explicitly
+    if last_value is None:
+        if order == SortOrder.ASC:
+            clauses.insert(0, {sort_field: {"$ne": None}})
+    else:
+        clauses.insert(0, {sort_field: {op: last_value}})
+        if order == SortOrder.DESC:
+            clauses.append({sort_field: None})
+    return {"$or": clauses}
+
+async def find_page(collection, limit: int, skip: int = 0, cursor: Optional[str] = None,
+                    projection: Optional[dict] = None, query: Optional[dict] = None,
+                    sort_field: str = "date", order: SortOrder = SortOrder.DESC) -> List[dict]:
+    """Fetch one page of a collection, by cursor when given or by skip/limit otherwise"""
+    query = query or {}
+    if cursor:
+        after = cursor_filter(cursor, sort_field, order)
+        find = collection.find({"$and": [query, after]} if query else after, projection)
+    else:
+        find = collection.find(query, projection).skip(skip)
+    return await find.sort(list_sort(sort_field, order)).limit(limit).to_list(limit)
+
+def page_headers(documents: List[dict], limit: int, sort_field: str = "date",
+                 order: SortOrder = SortOrder.DESC) -> dict:
+    """Headers for a list page; a full page carries the cursor for the next one"""
+    if limit > 0 and len(documents) == limit:
+        return {NEXT_CURSOR_HEADER: encode_cursor(documents[-1], sort_field, order)}
+    return {}
+
+# Serialization fast path: documents are only ever written from validated models, so list
+# endpoints project the model fields from Mongo and encode the rows directly with orjson
+# instead of building a model per row and validating it again through response_model
+SESSION_FIELDS = tuple(ShootingSession.model_fields)
+FIXTURE_FIELDS = tuple(Fixture.model_fields)
+SESSION_PROJECTION = {"_id": 0, **{field: 1 for field in SESSION_FIELDS}, "date": DATE_STRING_EXPR}
+FIXTURE_PROJECTION = {"_id": 0, **{field: 1 for field in FIXTURE_FIELDS}, "date": DATE_STRING_EXPR}
+
+def raw_rows(documents: List[dict], fields: tuple) -> List[dict]:
+    """Shape projected documents like their model, with missing optional fields as null"""
+    return [{field: document.get(field) for field in fields} for document in documents]
+
+# Calendar events are ordered on (date, time, type, id) with fixtures before sessions at the
+# same date and time. Both collections are read in that order and merged as streams
+CALENDAR_SORT = [("date", ASCENDING), ("time", ASCENDING), ("id", ASCENDING)]
+CALENDAR_EVENT_TYPES = ("fixture", "session")
+CALENDAR_PAGE_SIZE = 1000
+CALENDAR_MAX_PAGE_SIZE = 5000
+
+# Only the fields the calendar renders
+CALENDAR_FIXTURE_PROJECTION = {
+    "_id": 0, "id": 1, "name": 1, "date": DATE_STRING_EXPR, "time": 1, "discipline": 1, "location": 1,
+    "description": 1, "organizer": 1, "entry_fee": 1,
+}
+CALENDAR_SESSION_PROJECTION = {
+    "_id": 0, "id": 1, "date": DATE_STRING_EXPR, "time": 1, "discipline": 1, "location": 1,
+    "clays_hit": 1, "total_clays": 1, "fixture_name": 1,
+}
+
+def fixture_event(fixture: dict) -> dict:
+    return {
+        "id": fixture['id'],
+        "title": fixture['name'],
+        "date": fixture['date'],
+        "time": fixture['time'],
+        "type": "fixture",
+        "discipline": fixture['discipline'],
+        "location": fixture['location'],
+        "description": fixture.get('description', ''),
+        "organizer": fixture.get('organizer', ''),
+        "entry_fee": fixture.get('entry_fee'),
+    }
+
+def session_event(session: dict) -> dict:
+    accuracy = (session['clays_hit'] / session['total_clays'] * 100) if session['total_clays'] > 0 else 0
+    return {
+        "id": session['id'],
+        "title": f"Session - {session['discipline'].replace('_', ' ').title()}",
+        "date": session['date'],
+        "time": session['time'],
+        "type": "session",
+        "discipline": session['discipline'],
+        "location": session['location'],
+        "accuracy": round(accuracy, 1),
+        "clays_hit": session['clays_hit'],
+        "total_clays": session['total_clays'],
+        "fixture_name": session.get('fixture_name', ''),
+    }
+
+def calendar_event_key(event: dict) -> tuple:
+    return (event['date'], event['time'], CALENDAR_EVENT_TYPES.index(event['type']), event['id'])
+
+def calendar_after_filter(cursor: str, event_type: str) -> dict:
+    """Range filter selecting the events of one type that come after a calendar cursor"""
+    try:
+        last_date, last_time, last_type, last_id = decode_token(cursor)
+        last_date = to_bson_date(date.fromisoformat(last_date))
+        last_rank = CALENDAR_EVENT_TYPES.index(last_type)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    rank = CALENDAR_EVENT_TYPES.index(event_type)
+    conditions = [{"date": {"$gt": last_date}}, {"date": last_date, "time": {"$gt": last_time}}]
+    if rank == last_rank:
+        conditions.append({"date": last_date, "time": last_time, "id": {"$gt": last_id}})
+    elif rank > last_rank:
+        conditions.append({"date": last_date, "time": last_time})
+    return {"$or": conditions}
+
+def json_response(content, headers: Optional[dict] = None) -> Response:
+    """Encode pre-validated content straight to JSON, bypassing response_model"""
+    with phase_timer("encode"):
+        body = orjson.dumps(content)
+    return Response(body, media_type="application/json", headers=headers)
+
+# Partial updates (PUT endpoints)
+def partial_update(update_data: BaseModel) -> dict:
+    """Build the $set document for a partial update, storing dates as BSON dates"""
+    update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
+    
+    if 'date' in update_dict:
+        update_dict['date'] = to_bson_date(update_dict['date'])
+    
+    if not update_dict:
+        raise HTTPException(status_code=400, detail="No data to update")
+    return update_dict
+
+async def find_one_and_set(collection, document_id: str, update_dict: dict, projection: dict,
+                           not_found: str, return_document=ReturnDocument.AFTER,
+                           computed: Optional[dict] = None) -> dict:
+    """Apply a partial update by id and read the document back atomically in one round trip.
+
+    Fields in ``computed`` are aggregation expressions evaluated against the updated
+    document, which turns the update into a pipeline update.
+    """
+    update = {"$set": update_dict}
+    if computed:
+        update = [{"$set": {k: {"$literal": v} for k, v in update_dict.items()}}, {"$set": computed}]
+    document = await collection.find_one_and_update(
+        {"id": document_id},
+        update,
+        projection=projection,
+        return_document=return_document
+    )
+    if document is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    return document
+
+# Session creation
+def prepare_session(session_data: ShootingSessionCreate, fixture_names: dict) -> Tuple[ShootingSession, dict]:
+    """Build the session model and its storage document, denormalizing the fixture name"""
     session_dict = session_data.dict()
-    # Convert date to string for MongoDB storage
-    session_dict['date'] = session_dict['date'].isoformat()
+    session_dict['accuracy'] = session_accuracy(session_dict)
     
-    # If fixture_id is provided, fetch fixture details
     if session_dict.get('fixture_id'):
-        fixture = await db.fixtures.find_one({"id": session_dict['fixture_id']})
-        if fixture:
-            session_dict['fixture_name'] = fixture['name']
+        if session_dict['fixture_id'] in fixture_names:
+            session_dict['fixture_name'] = fixture_names[session_dict['fixture_id']]
         else:
             # If fixture not found, clear the fixture_id
             session_dict['fixture_id'] = None
             session_dict['fixture_name'] = None
     
-    session_obj = ShootingSession(**session_dict)
+    with phase_timer("validate"):
+        session_obj = ShootingSession(**session_dict)
     
-    # Store the dict with string date for MongoDB
     storage_dict = session_dict.copy()
+    storage_dict['date'] = to_bson_date(session_obj.date)
     storage_dict['id'] = session_obj.id
     storage_dict['created_at'] = session_obj.created_at
+    return session_obj, storage_dict
+
+async def lookup_fixture_names(fixture_ids: Iterable[str]) -> dict:
+    """Map fixture ids to names with a single $in query; unknown ids are left out"""
+    fixture_ids = list(fixture_ids)
+    if not fixture_ids:
+        return {}
+    fixtures = await db.fixtures.find(
+        {"id": {"$in": fixture_ids}}, {"_id": 0, "id": 1, "name": 1}
+    ).to_list(None)
+    return {fixture['id']: fixture['name'] for fixture in fixtures}
+
+# Bulk import
+BULK_MAX_ROWS = 5000
+BULK_CHUNK_SIZE = 500
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+def declared_charset(content_type: str) -> str:
+    """The charset parameter of a Content-Type header, UTF-8 (with or without a BOM) if none"""
+    for parameter in content_type.split(";")[1:]:
+        name, _, value = parameter.partition("=")
+        if name.strip().lower() == "charset" and value.strip():
+            charset = value.strip().strip('"').lower()
+            return "utf-8-sig" if charset in ("utf-8", "utf8") else charset
+    return "utf-8-sig"
+
+async def parse_bulk_rows(request: Request) -> List[Union[dict, str]]:
+    """Split a bulk import body into raw rows; rows that cannot be parsed become error strings"""
+    header = request.headers.get("content-type", "")
+    content_type = header.split(";")[0].strip().lower()
+    charset = declared_charset(header)
+    try:
+        body = (await request.body()).decode(charset)
+    except (LookupError, UnicodeDecodeError):
+        # Spreadsheet CSV exports are often Windows-1252 rather than UTF-8
+        raise HTTPException(
+            status_code=400,
+            detail=f"Body is not valid {charset.removesuffix('-sig')} text; save the file as UTF-8 "
+                   "or declare its encoding, e.g. Content-Type: text/csv; charset=windows-1252"
+        )
+    
+    if content_type == "application/json":
+        try:
+            rows = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of sessions")
+        return [row if isinstance(row, dict) else "Row is not a JSON object" for row in rows]
+    
+    if content_type in NDJSON_CONTENT_TYPES:
+        rows = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                rows.append("Invalid JSON line")
+                continue
+            rows.append(row if isinstance(row, dict) else "Row is not a JSON object")
+        return rows
+    
+    if content_type == "text/csv":
+        # Empty cells are treated as missing so optional fields fall back to their defaults
+        return [
+            {field: value for field, value in row.items() if field and value not in (None, "")}
+            for row in csv.DictReader(io.StringIO(body))
+        ]
+    
+    raise HTTPException(
+        status_code=415,
+        detail="Send sessions as application/json, application/x-ndjson or text/csv"
+    )
+
+# Time-bucketed performance series. Buckets are the stored date truncated with $dateTrunc
+# (weeks start on Monday) and labelled with the YYYY-MM-DD of the bucket start
+def _series_bucket(unit: str, **options) -> dict:
+    return {"$dateToString": {"format": "%Y-%m-%d", "date": {"$dateTrunc": {
+        "date": DATE_VALUE_EXPR, "unit": unit, **options,
+    }}}}
+
+SERIES_BUCKETS = {
+    SeriesBucketSize.DAY: _series_bucket("day"),
+    SeriesBucketSize.WEEK: _series_bucket("week", startOfWeek="monday"),
+    SeriesBucketSize.MONTH: _series_bucket("month"),
+}
+SERIES_SUMS = {
+    "sessions": {"$sum": "$sessions"},
+    "total_clays": {"$sum": "$total_clays"},
+    "clays_hit": {"$sum": "$clays_hit"},
+}
+
+def series_pipeline(query: dict, bucket: SeriesBucketSize, limit: Optional[int]) -> list:
+    """Group sessions per bucket and discipline, then roll up per bucket and per discipline"""
+    points = [
+        {"$group": {
+            "_id": "$_id.bucket",
+            **SERIES_SUMS,
+            "disciplines": {"$push": {
+                "discipline": "$_id.discipline",
+                "sessions": "$sessions",
+                "total_clays": "$total_clays",
+                "clays_hit": "$clays_hit",
+            }},
+        }},
+        {"$sort": {"_id": -1}},
+    ]
+    if limit:
+        points.append({"$limit": limit})
+    return [
+        {"$match": query},
+        {"$group": {
+            "_id": {"bucket": SERIES_BUCKETS[bucket], "discipline": "$discipline"},
+            "sessions": {"$sum": 1},
+            "total_clays": {"$sum": "$total_clays"},
+            "clays_hit": {"$sum": "$clays_hit"},
+        }},
+        {"$facet": {
+            "points": points,
+            "disciplines": [
+                {"$group": {"_id": "$_id.discipline", **SERIES_SUMS}},
+                {"$sort": {"sessions": -1, "_id": 1}},
+            ],
+        }},
+    ]
+
+def _series_totals(group: dict) -> dict:
+    accuracy = (group['clays_hit'] / group['total_clays'] * 100) if group['total_clays'] > 0 else 0
+    return {
+        "sessions": group['sessions'],
+        "total_clays": group['total_clays'],
+        "clays_hit": group['clays_hit'],
+        "accuracy": round(accuracy, 1),
+    }
+
+# Session list filters, shared by the list and export endpoints
+def session_filters(discipline: Optional[DisciplineType] = None,
+                    start_date: Optional[date] = None,
+                    end_date: Optional[date] = None,
+                    location: Optional[str] = None,
+                    fixture_id: Optional[str] = None,
+                    gun: Optional[str] = None,
+                    min_accuracy: Optional[float] = None,
+                    max_accuracy: Optional[float] = None) -> dict:
+    """Build the Mongo filter for the session list query parameters"""
+    query = {}
+    if discipline:
+        query['discipline'] = discipline.value
+    if start_date or end_date:
+        query['date'] = {}
+        if start_date:
+            query['date']['$gte'] = to_bson_date(start_date)
+        if end_date:
+            query['date']['$lte'] = to_bson_date(end_date)
+    if location:
+        query['location'] = {"$regex": re.escape(location), "$options": "i"}
+    if fixture_id:
+        query['fixture_id'] = fixture_id
+    if gun:
+        query['gun_used'] = {"$regex": re.escape(gun), "$options": "i"}
+    if min_accuracy is not None or max_accuracy is not None:
+        query['accuracy'] = {}
+        if min_accuracy is not None:
+            query['accuracy']['$gte'] = min_accuracy
+        if max_accuracy is not None:
+            query['accuracy']['$lte'] = max_accuracy
+    return query
+
+ACCURACY_BACKFILL_ON_STARTUP = os.environ.get('ACCURACY_BACKFILL_ON_STARTUP', 'true').lower() in ('1', 'true', 'yes')
+
+async def backfill_session_accuracy() -> int:
+    """Store the accuracy field on sessions written before it existed"""
+    result = await db.shooting_sessions.update_many(
+        {"accuracy": {"$exists": False}},
+        [{"$set": {"accuracy": SESSION_ACCURACY_EXPR}}]
+    )
+    logger.info("Backfilled accuracy on %d sessions", result.modified_count)
+    if result.modified_count:
+        await collection_changed("shooting_sessions")
+    return result.modified_count
+
+async def migrate_dates(collection_name: str, batch_size: int = DATE_MIGRATION_BATCH_SIZE) -> int:
+    """Convert ISO string dates to BSON dates a batch at a time.
+
+    Each batch only touches documents whose date is still a string, so an interrupted
+    run picks up where it stopped when started again.
+    """
+    collection = db[collection_name]
+    migrated = 0
+    while True:
+        batch = await collection.find(
+            {"date": {"$type": "string"}}, {"_id": 1, "date": 1}
+        ).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+        result = await collection.bulk_write([
+            UpdateOne(
+                {"_id": document['_id'], "date": document['date']},
+                {"$set": {"date": to_bson_date(date.fromisoformat(document['date']))}}
+            )
+            for document in batch
+        ], ordered=False)
+        migrated += result.modified_count
+        logger.info("Migrated dates on %d %s documents", migrated, collection_name)
+    if migrated:
+        await collection_changed(collection_name)
+    return migrated
+
+async def migrate_dates_in_background():
+    """Startup job finishing any interrupted or never-run date migration"""
+    try:
+        for collection_name in ("shooting_sessions", "fixtures"):
+            await migrate_dates(collection_name)
+    except Exception:
+        logger.exception("Date migration failed; run manage.py migrate-dates to finish it")
+
+async def backfill_accuracy_in_background():
+    """Startup job storing accuracy on sessions written before the field existed"""
+    try:
+        await backfill_session_accuracy()
+    except Exception:
+        logger.exception("Accuracy backfill failed; run manage.py backfill-accuracy to finish it")
+
+# Streaming export
+EXPORT_BATCH_SIZE = 1000
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def encode_export_batch(documents: List[dict], fields: tuple, export_format: ExportFormat) -> bytes:
+    with phase_timer("encode"):
+        rows = raw_rows(documents, fields)
+        if export_format == ExportFormat.NDJSON:
+            return b"".join(orjson.dumps(row) + b"\n" for row in rows)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows([_csv_value(row[field]) for field in fields] for row in rows)
+        return buffer.getvalue().encode()
+
+async def stream_export(collection, query: dict, projection: dict, fields: tuple,
+                        export_format: ExportFormat, sort: list) -> AsyncIterator[bytes]:
+    """Stream matching documents straight from a Motor cursor, one batch at a time"""
+    if export_format == ExportFormat.CSV:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(fields)
+        yield buffer.getvalue().encode()
+    
+    cursor = collection.find(query, projection).sort(sort).batch_size(EXPORT_BATCH_SIZE)
+    batch = []
+    async for document in cursor:
+        batch.append(document)
+        if len(batch) == EXPORT_BATCH_SIZE:
+            yield encode_export_batch(batch, fields, export_format)
+            batch = []
+    if batch:
+        yield encode_export_batch(batch, fields, export_format)
+
+def export_response(name: str, chunks: AsyncIterator[bytes], export_format: ExportFormat) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[export_format.value],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format.value}"'}
+    )
+
+# Indexes provisioned at startup, keyed by collection name
+INDEXES = {
+    "shooting_sessions": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel(LIST_SORT, name="date_created_id"),
+        IndexModel([("fixture_id", ASCENDING)], name="fixture_id"),
+        IndexModel(list_sort("accuracy"), name="accuracy_created_id"),
+        IndexModel([("discipline", ASCENDING)] + LIST_SORT, name="discipline_date_created_id"),
+        IndexModel(CALENDAR_SORT, name="date_time_id"),
+    ],
+    "fixtures": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel(LIST_SORT, name="date_created_id"),
+        IndexModel(CALENDAR_SORT, name="date_time_id"),
+    ],
+}
+
+async def ensure_collection_indexes(collection_name: str, indexes: List[IndexModel]):
+    try:
+        names = await db[collection_name].create_indexes(indexes)
+        logger.info("Indexes ready on %s: %s", collection_name, ", ".join(names))
+    except OperationFailure as e:
+        logger.error("Failed to build indexes on %s: %s", collection_name, e)
+
+async def ensure_indexes():
+    """Idempotently create the indexes every collection relies on, all collections at once"""
+    await asyncio.gather(*(
+        ensure_collection_indexes(collection_name, indexes) for collection_name, indexes in INDEXES.items()
+    ))
+
+# In-process response cache for hot read endpoints. Entries hold the serialized body and are
+# dropped by the write handlers of the collections they were built from
+RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+RESPONSE_CACHE_TTL_SECONDS = float(os.environ.get('RESPONSE_CACHE_TTL_SECONDS', '30'))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '256'))
+CACHE_STATUS_HEADER = "X-Cache"
+
+# Response compression; cached bodies keep their compressed forms so hits skip recompression
+COMPRESSION_MINIMUM_SIZE = int(os.environ.get('COMPRESSION_MINIMUM_SIZE', '1024'))
+COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', '6'))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '4'))
+
+# Slow-request profiler; off by default, and when off the middleware is not installed at all
+PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+PROFILER_THRESHOLD_SECONDS = float(os.environ.get('PROFILER_THRESHOLD_SECONDS', '1.0'))
+PROFILER_SAMPLE_RATE = float(os.environ.get('PROFILER_SAMPLE_RATE', '0'))
+PROFILER_INTERVAL_SECONDS = float(os.environ.get('PROFILER_INTERVAL_SECONDS', '0.005'))
+PROFILER_MAX_PROFILES = int(os.environ.get('PROFILER_MAX_PROFILES', '50'))
+profile_store = ProfileStore(PROFILER_MAX_PROFILES)
+
+class ProfileFormat(str, Enum):
+    SPEEDSCOPE = "speedscope"
+    COLLAPSED = "collapsed"
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    headers: dict
+    encoded: dict  # Compressed bodies by content coding, filled on first use
+
+    def encode(self, encoding: Optional[str]) -> Optional[bytes]:
+        """The body compressed with ``encoding``, or None when it should be sent as is"""
+        if encoding is None or len(self.body) < COMPRESSION_MINIMUM_SIZE:
+            return None
+        if encoding not in self.encoded:
+            self.encoded[encoding] = compress(
+                self.body, encoding, COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY
+            )
+        return self.encoded[encoding]
+
+class TTLCache:
+    """Bounded LRU cache whose entries also expire after a TTL"""
+
+    def __init__(self, name: str, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+                 ttl: float = RESPONSE_CACHE_TTL_SECONDS):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Bumped on every invalidation, so a value computed before a write is never stored after it
+        self.generation = 0
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, generation: int):
+        if generation != self.generation:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one entry, or every entry when no key is given"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+        self.generation += 1
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+RESPONSE_CACHES = {name: TTLCache(name) for name in ("sessions", "fixtures", "stats", "series", "calendar")}
+
+# Response caches built from each collection
+CACHE_DEPENDENCIES = {
+    "shooting_sessions": ("sessions", "stats", "series", "calendar"),
+    "fixtures": ("fixtures", "calendar"),
+    "session_stats": ("stats",),
+}
+
+# Collections each cached endpoint reads, the inverse of CACHE_DEPENDENCIES
+CACHE_SOURCES = {
+    cache_name: tuple(collection for collection, caches in CACHE_DEPENDENCIES.items() if cache_name in caches)
+    for cache_name in RESPONSE_CACHES
+}
+
+# Per-collection version counters behind the ETags of the cached endpoints, kept in Mongo so
+# every worker (and every restart) derives the same ETag for the same data. Each document also
+# carries an epoch picked when it is first created, so counters that restart from zero after
+# the collection is dropped never reproduce an old ETag
+COLLECTION_VERSIONS_COLLECTION = "collection_versions"
+# How long a worker trusts its copy of the versions when no invalidation bus is listening
+COLLECTION_VERSIONS_TTL_SECONDS = float(os.environ.get('COLLECTION_VERSIONS_TTL_SECONDS', '1.0'))
+
+def version_string(document: dict) -> str:
+    return f"{document['epoch']}.{document['version']}"
+
+class CollectionVersions:
+    """This worker's in-memory copy of the shared collection versions.
+
+    Cached reads and 304s are answered from the copy. It takes the new version straight from
+    this worker's own bumps, and is re-read from Mongo after the invalidation bus reports a
+    write from elsewhere or (re)starts, or, with no bus listening, once it is ``ttl`` old.
+    """
+
+    def __init__(self, ttl: float = COLLECTION_VERSIONS_TTL_SECONDS):
+        self.ttl = ttl
+        self.generation = 0
+        self.reads = 0
+        self._versions: Dict[str, str] = {}
+        self._loaded_at: Optional[float] = None
+
+    def _fresh(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        return invalidation_bus.active_mode is not None or time.monotonic() - self._loaded_at < self.ttl
+
+    async def get(self, collection_names: Iterable[str]) -> Dict[str, str]:
+        versions = self._versions
+        if not self._fresh():
+            generation = self.generation
+            documents = await db[COLLECTION_VERSIONS_COLLECTION].find({}).to_list(None)
+            self.reads += 1
+            versions = {document['_id']: version_string(document) for document in documents}
+            # A bump or notice that landed during the read may be newer than what it returned
+            if generation == self.generation:
+                self._versions = versions
+                self._loaded_at = time.monotonic()
+        return {name: versions.get(name, "0") for name in collection_names}
+
+    def set(self, collection_name: str, version: str):
+        self._versions = {**self._versions, collection_name: version}
+        self.generation += 1
+
+    def expire(self):
+        """Re-read on the next request: a write happened elsewhere, or notices may have been missed"""
+        self._loaded_at = None
+        self.generation += 1
+
+    def stats(self) -> dict:
+        return {"reads": self.reads, "ttl_seconds": self.ttl, "versions": dict(self._versions)}
+
+collection_versions = CollectionVersions()
+
+async def bump_collection_version(collection_name: str):
+    document = await db[COLLECTION_VERSIONS_COLLECTION].find_one_and_update(
+        {"_id": collection_name},
+        {"$inc": {"version": 1}, "$setOnInsert": {"epoch": uuid.uuid4().hex}},
+        upsert=True, return_document=ReturnDocument.AFTER,
+    )
+    collection_versions.set(collection_name, version_string(document))
+
+def invalidate_collection(collection_name: str):
+    """Invalidate every cached response this worker built from a collection"""
+    for cache_name in CACHE_DEPENDENCIES[collection_name]:
+        RESPONSE_CACHES[cache_name].invalidate()
+
+async def collection_changed(collection_name: str):
+    """After a write: bump the shared version, invalidate here and, through the bus, elsewhere"""
+    invalidate_collection(collection_name)
+    await bump_collection_version(collection_name)
+    invalidation_bus.publish(collection_name)
+
+def remote_collection_changed(collection_name: str):
+    """Apply a write made by another worker (or another client, with change streams)"""
+    collection_versions.expire()
+    if collection_name == COLLECTION_VERSIONS_COLLECTION:
+        return
+    invalidate_collection(collection_name)
+    if collection_name == "fixtures":
+        fixture_name_cache.clear()
+
+def response_etag(request: Request, versions: Dict[str, str]) -> str:
+    """Strong ETag for a cached endpoint: its query plus the versions of the collections it reads"""
+    version_list = ",".join(f"{name}:{version}" for name, version in sorted(versions.items()))
+    digest = hashlib.sha1(f"{cache_key(request)}|{version_list}".encode()).hexdigest()
+    return f'"{digest}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+def cache_key(request: Request) -> str:
+    return f"{request.url.path}?{urlencode(sorted(request.query_params.multi_items()))}"
+
+async def cached_response(cache_name: str, request: Request,
+                          produce: Callable[[], Awaitable[Response]]) -> Response:
+    """Serve a read endpoint conditionally and from its response cache.
+
+    The ETag comes from this worker's copy of the collection versions, so a matching
+    If-None-Match is answered with 304 without touching Mongo. Otherwise the body comes
+    from the cache, or is produced and stored on a miss; a request with
+    ``Cache-Control: no-cache`` skips the lookup and refreshes the entry.
+    """
+    # Read before producing the body, so the ETag is never newer than the data it labels
+    versions = await collection_versions.get(CACHE_SOURCES[cache_name])
+    etag = response_etag(request, versions)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    
+    if not RESPONSE_CACHE_ENABLED:
+        response = await produce()
+    else:
+        response = await _serve_from_cache(RESPONSE_CACHES[cache_name], request, produce, etag)
+    if response.status_code == 200:
+        # Compressed bodies are different bytes, so their ETag is weak
+        compressed = "content-encoding" in response.headers
+        response.headers["ETag"] = weaken_etag(etag) if compressed else etag
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+async def _serve_from_cache(cache: TTLCache, request: Request,
+                            produce: Callable[[], Awaitable[Response]], etag: str) -> Response:
+    # Keyed by ETag, i.e. by the shared versions, so an entry built before a write that this
+    # worker has not heard about yet is never served after it
+    key = etag
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    cached = None
+    if "no-cache" not in request.headers.get("cache-control", ""):
+        cached = cache.get(key)
+    if cached is None:
+        generation = cache.generation
+        response = await produce()
+        if response.status_code != 200:
+            return response
+        headers = {name: value for name, value in response.headers.items()
+                   if name not in ("content-length", "content-type")}
+        cached = CachedResponse(response.body, headers, {})
+        cache.set(key, cached, generation)
+        status = "MISS"
+    else:
+        status = "HIT"
+    
+    headers = {**cached.headers, CACHE_STATUS_HEADER: status}
+    body = cached.encode(encoding)
+    if body is None:
+        body = cached.body
+    else:
+        headers.update({"Content-Encoding": encoding, "Vary": "Accept-Encoding"})
+    return Response(body, media_type="application/json", headers=headers)
+
+# Denormalized fixture links on sessions. Sessions copy the fixture name so reads stay
+# join-free; fixture renames and deletes fan out with one update_many on the indexed fixture_id
+FIXTURE_DELETE_POLICY = FixtureDeletePolicy(os.environ.get('FIXTURE_DELETE_POLICY', 'nullify'))
+FIXTURE_RECONCILE_INTERVAL_SECONDS = float(os.environ.get('FIXTURE_RECONCILE_INTERVAL_SECONDS', '3600'))
+FIXTURE_RECONCILE_BATCH_SIZE = 500
+
+FIXTURE_NAME_CACHE_TTL_SECONDS = float(os.environ.get('FIXTURE_NAME_CACHE_TTL_SECONDS', '60'))
+FIXTURE_NAME_CACHE_MAX_ENTRIES = 1024
+
+class FixtureNameCache:
+    """Fixture id to name lookups for session writes, cached with a TTL.
+
+    Concurrent lookups for the same ids share one in-flight query (single-flight),
+    so a burst of score entries against one fixture costs a single Mongo round trip.
+    """
+
+    def __init__(self, ttl: float = FIXTURE_NAME_CACHE_TTL_SECONDS,
+                 max_entries: int = FIXTURE_NAME_CACHE_MAX_ENTRIES):
+        self.names = TTLCache("fixture_names", max_entries=max_entries, ttl=ttl)
+        self.coalesced = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def get_many(self, fixture_ids: Iterable[str]) -> dict:
+        """Map fixture ids to names; unknown ids are left out"""
+        result, waiting, to_load = {}, {}, []
+        for fixture_id in set(fixture_ids):
+            name = self.names.get(fixture_id)
+            if name is not None:
+                result[fixture_id] = name
+            elif fixture_id in self._inflight:
+                waiting[fixture_id] = self._inflight[fixture_id]
+                self.coalesced += 1
+            else:
+                to_load.append(fixture_id)
+        
+        if to_load:
+            loop = asyncio.get_running_loop()
+            futures = {fixture_id: loop.create_future() for fixture_id in to_load}
+            self._inflight.update(futures)
+            generation = self.names.generation
+            try:
+                loaded = await lookup_fixture_names(to_load)
+            except Exception as e:
+                for future in futures.values():
+                    future.set_exception(e)
+                    future.exception()  # Mark retrieved; waiters re-raise it themselves
+                raise
+            else:
+                for fixture_id, future in futures.items():
+                    name = loaded.get(fixture_id)
+                    if name is not None:
+                        self.names.set(fixture_id, name, generation)
+                        result[fixture_id] = name
+                    future.set_result(name)
+            finally:
+                for fixture_id in to_load:
+                    self._inflight.pop(fixture_id, None)
+        
+        for fixture_id, future in waiting.items():
+            name = await future
+            if name is not None:
+                result[fixture_id] = name
+        return result
+
+    def invalidate(self, fixture_id: str):
+        self.names.invalidate(fixture_id)
+
+    def clear(self):
+        self.names.invalidate()
+
+    def stats(self) -> dict:
+        return {**self.names.stats(), "coalesced": self.coalesced, "inflight": len(self._inflight)}
+
+fixture_name_cache = FixtureNameCache()
+
+# Each worker's caches hear about writes made by the others, whichever way the workers were
+# started. "auto" uses change streams where the deployment has them and a tailed capped
+# collection otherwise; "none" is only safe for a single process. ETags and response cache
+# entries follow the shared collection versions either way; the bus keeps each worker's copy
+# of them current (with "none" it is re-read every COLLECTION_VERSIONS_TTL_SECONDS) and frees
+# stale entries early. Change streams report a data write before the version bump that follows
+# it, so they also watch collection_versions
+CACHE_INVALIDATION_BUS = os.environ.get('CACHE_INVALIDATION_BUS', 'auto')
+invalidation_bus = InvalidationBus((*CACHE_DEPENDENCIES, COLLECTION_VERSIONS_COLLECTION),
+                                   remote_collection_changed, mode=CACHE_INVALIDATION_BUS)
+
+# Live updates: session and fixture deltas (with their calendar events) and fresh stats are
+# pushed to /api/live subscribers from a change stream, so clients need not refetch
+LIVE_UPDATES_ENABLED = os.environ.get('LIVE_UPDATES_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+LIVE_UPDATES_HEARTBEAT_SECONDS = float(os.environ.get('LIVE_UPDATES_HEARTBEAT_SECONDS', '15'))
+LIVE_UPDATES_QUEUE_SIZE = int(os.environ.get('LIVE_UPDATES_QUEUE_SIZE', '256'))
+# Bursts of writes (bulk imports) update the rollup many times; stats are pushed once per burst
+LIVE_STATS_DEBOUNCE_SECONDS = float(os.environ.get('LIVE_STATS_DEBOUNCE_SECONDS', '0.25'))
+LIVE_COLLECTIONS = {"shooting_sessions": "session", "fixtures": "fixture"}
+
+def live_row(document: dict, fields: tuple) -> dict:
+    """Shape a full change-stream document like a list row"""
+    row = {field: document.get(field) for field in fields}
+    row['date'] = as_date(row['date']).isoformat()
+    return row
+
+def change_to_events(change: dict) -> List[dict]:
+    collection_name = change['ns']['coll']
+    if collection_name == "session_stats":
+        schedule_stats_push()
+        return []
+    kind = LIVE_COLLECTIONS[collection_name]
+    if kind == "session":
+        # The streak follows session dates, which the rollup does not track, so any session
+        # write can change the stats even when session_stats stays the same
+        schedule_stats_push()
+    operation = change['operationType']
+    if operation == "delete":
+        # The id is only known from the pre-image; without one clients have to refetch
+        before = change.get('fullDocumentBeforeChange') or {}
+        return [{"type": kind, "op": "delete", "id": before['id']}] if before.get('id') else [RESYNC]
+    if operation in ("insert", "update", "replace"):
+        document = change.get('fullDocument')
+        if document is None:  # Deleted again before the update was looked up
+            return []
+        if kind == "session":
+            row = live_row(document, SESSION_FIELDS)
+            event = session_event(row)
+        else:
+            row = live_row(document, FIXTURE_FIELDS)
+            event = fixture_event(row)
+        return [{"type": kind, "op": "upsert", "id": row['id'], "data": row, "event": event}]
+    return [RESYNC]
+
+live_updates = LiveUpdates([*LIVE_COLLECTIONS, "session_stats"], change_to_events, queue_size=LIVE_UPDATES_QUEUE_SIZE)
+stats_push: Optional[asyncio.Task] = None
+# Set by rollup changes that arrive while a push is already scheduled or computing
+stats_dirty = False
+
+def schedule_stats_push():
+    global stats_push, stats_dirty
+    stats_dirty = True
+    if stats_push is None or stats_push.done():
+        stats_push = asyncio.create_task(push_stats())
+
+async def push_stats():
+    """Push stats once per burst, recomputing until no change arrived during the compute"""
+    global stats_dirty
+    while stats_dirty:
+        await asyncio.sleep(LIVE_STATS_DEBOUNCE_SECONDS)
+        stats_dirty = False
+        try:
+            stats = await compute_stats()
+        except Exception:
+            logger.exception("Failed to compute stats for live updates")
+            return
+        live_updates.broadcast({"type": "stats", "data": stats.model_dump()})
+
+async def enable_change_stream_pre_images():
+    """Store pre-images so delete events still carry the id of what was deleted (MongoDB 6.0+)"""
+    async def enable(collection_name: str):
+        try:
+            await db.command("collMod", collection_name, changeStreamPreAndPostImages={"enabled": True})
+        except OperationFailure as e:
+            logger.info("Change stream pre-images not enabled on %s: %s", collection_name, e)
+    await asyncio.gather(*map(enable, LIVE_COLLECTIONS))
+
+async def propagate_fixture_rename(fixture_id: str, name: str) -> int:
+    result = await db.shooting_sessions.update_many(
+        {"fixture_id": fixture_id, "fixture_name": {"$ne": name}},
+        {"$set": {"fixture_name": name}}
+    )
+    if result.modified_count:
+        await collection_changed("shooting_sessions")
+    return result.modified_count
+
+async def unlink_fixture_sessions(fixture_ids: List[str]) -> int:
+    """Clear the fixture link on every session pointing at one of the given fixtures"""
+    result = await db.shooting_sessions.update_many(
+        {"fixture_id": {"$in": fixture_ids}},
+        {"$set": {"fixture_id": None, "fixture_name": None}}
+    )
+    if result.modified_count:
+        await collection_changed("shooting_sessions")
+    return result.modified_count
+
+async def delete_fixture_sessions(fixture_id: str) -> int:
+    """Delete every session of a fixture and take them out of the stats rollup"""
+    groups = await db.shooting_sessions.aggregate([
+        {"$match": {"fixture_id": fixture_id}},
+        {"$group": {
+            "_id": "$discipline",
+            "sessions": {"$sum": 1},
+            "total_clays": {"$sum": "$total_clays"},
+            "total_hits": {"$sum": "$clays_hit"},
+            "best_accuracy": {"$max": SESSION_ACCURACY_EXPR},
+        }},
+    ]).to_list(None)
+    if not groups:
+        return 0
+    
+    result = await db.shooting_sessions.delete_many({"fixture_id": fixture_id})
+    inc = {}
+    for group in groups:
+        inc['total_sessions'] = inc.get('total_sessions', 0) - group['sessions']
+        inc['total_clays'] = inc.get('total_clays', 0) - group['total_clays']
+        inc['total_hits'] = inc.get('total_hits', 0) - group['total_hits']
+        inc[f"disciplines.{group['_id']}"] = -group['sessions']
+    await apply_stats_delta(inc, removed_accuracy=max(group['best_accuracy'] for group in groups))
+    await collection_changed("shooting_sessions")
+    return result.deleted_count
+
+async def reconcile_fixture_links(batch_size: int = FIXTURE_RECONCILE_BATCH_SIZE) -> dict:
+    """Repair sessions whose fixture name is stale or whose fixture no longer exists.
+
+    Sessions are grouped by (fixture_id, fixture_name) first, so each distinct link is
+    looked up once; repairs are written in batches of update_many operations.
+
+    Links to a deleted fixture are always cleared, whatever FIXTURE_DELETE_POLICY says:
+    they are left behind by deletes that failed part way, and a background repair should
+    never delete sessions on its own.
+    """
+    drift = db.shooting_sessions.aggregate([
+        {"$match": {"fixture_id": {"$ne": None}}},
+        {"$group": {"_id": {"fixture_id": "$fixture_id", "fixture_name": "$fixture_name"}}},
+        {"$lookup": {"from": "fixtures", "localField": "_id.fixture_id", "foreignField": "id", "as": "fixture"}},
+        {"$project": {"_id": 0, "fixture_id": "$_id.fixture_id", "stored_name": "$_id.fixture_name",
+                      "name": {"$first": "$fixture.name"}, "exists": {"$gt": [{"$size": "$fixture"}, 0]}}},
+        {"$match": {"$expr": {"$or": [{"$not": ["$exists"]}, {"$ne": ["$stored_name", "$name"]}]}}},
+    ])
+    renamed = unlinked = 0
+    renames, dangling = [], []
+    
+    async def flush():
+        nonlocal renamed, unlinked, renames, dangling
+        if renames:
+            result = await db.shooting_sessions.bulk_write(renames, ordered=False)
+            renamed += result.modified_count
+        if dangling:
+            unlinked += await unlink_fixture_sessions(dangling)
+        renames, dangling = [], []
+    
+    async for link in drift:
+        if link['exists']:
+            renames.append(UpdateMany(
+                {"fixture_id": link['fixture_id'], "fixture_name": link['stored_name']},
+                {"$set": {"fixture_name": link['name']}}
+            ))
+        else:
+            dangling.append(link['fixture_id'])
+        if len(renames) + len(dangling) >= batch_size:
+            await flush()
+    await flush()
+    
+    if renamed:
+        await collection_changed("shooting_sessions")
+    if renamed or unlinked:
+        logger.info("Reconciled fixture links: %d renamed, %d unlinked", renamed, unlinked)
+    return {"renamed": renamed, "unlinked": unlinked}
+
+# Periodic jobs that every worker schedules but only one should run. A run is claimed by
+# moving the job's last_run forward, which only the first worker to wake up can do
+JOB_RUNS_COLLECTION = "job_runs"
+
+async def claim_job_run(job: str, interval: float) -> bool:
+    """Claim this interval's run of a job; False when another worker already has it"""
+    now = datetime.utcnow()
+    try:
+        # With no match the upsert inserts the job's document, which fails if it already exists
+        await db[JOB_RUNS_COLLECTION].update_one(
+            {"_id": job, "last_run": {"$lte": now - timedelta(seconds=interval / 2)}},
+            {"$set": {"last_run": now, "worker_pid": os.getpid()}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        return False
+    return True
+
+async def run_fixture_reconciliation(interval: float):
+    """Background job that periodically repairs fixture link drift, in one worker per interval"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if await claim_job_run("fixture_reconciliation", interval):
+                await reconcile_fixture_links()
+        except Exception:
+            logger.exception("Fixture link reconciliation failed")
+
+# Routes
+@api_router.get("/")
+async def root():
+    return {"message": "Clay Tracker Australia - Shooting Performance API"}
+
+@api_router.post("/sessions", response_model=ShootingSession)
+async def create_session(session_data: ShootingSessionCreate):
+    fixture_names = await fixture_name_cache.get_many([session_data.fixture_id] if session_data.fixture_id else [])
+    session_obj, storage_dict = prepare_session(session_data, fixture_names)
     
     result = await db.shooting_sessions.insert_one(storage_dict)
     if result.inserted_id:
+        await apply_stats_delta(
+            _stats_delta(storage_dict, 1), added_accuracy=session_accuracy(storage_dict)
+        )
+        await collection_changed("shooting_sessions")
         return session_obj
     raise HTTPException(status_code=500, detail="Failed to create session")
 
+@api_router.post("/sessions/bulk", response_model=BulkImportResult)
+async def bulk_create_sessions(request: Request):
+    """Import many sessions at once from a JSON array, NDJSON or CSV body.
+
+    Fixtures are resolved with one $in query and rows are written with unordered
+    insert_many in chunks; the response reports the outcome of every row.
+    """
+    rows = await parse_bulk_rows(request)
+    if len(rows) > BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ROWS} rows per import")
+    
+    results = [BulkRowResult(index=index, status="error") for index in range(len(rows))]
+    valid = []
+    with phase_timer("validate"):
+        for index, row in enumerate(rows):
+            if isinstance(row, str):
+                results[index].errors = [row]
+                continue
+            try:
+                valid.append((index, ShootingSessionCreate.model_validate(row)))
+            except ValidationError as e:
+                results[index].errors = [
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+                ]
+    
+    fixture_names = await fixture_name_cache.get_many({data.fixture_id for _, data in valid if data.fixture_id})
+    prepared = [(index, *prepare_session(data, fixture_names)) for index, data in valid]
+    
+    stats_inc, best_accuracy = {}, None
+    try:
+        for start in range(0, len(prepared), BULK_CHUNK_SIZE):
+            chunk = prepared[start:start + BULK_CHUNK_SIZE]
+            failed = {}
+            try:
+                await db.shooting_sessions.insert_many([storage for _, _, storage in chunk], ordered=False)
+            except BulkWriteError as e:
+                failed = {error['index']: error['errmsg'] for error in e.details.get('writeErrors', [])}
+            except Exception:
+                # Some of this chunk may have been written; only a full recompute can tell
+                logger.error("Bulk import failed mid-chunk; run manage.py check-stats to verify the rollup")
+                raise
+            for position, (index, session_obj, storage_dict) in enumerate(chunk):
+                if position in failed:
+                    results[index].errors = [failed[position]]
+                    continue
+                results[index].status = "created"
+                results[index].id = session_obj.id
+                _stats_delta(storage_dict, 1, stats_inc)
+                accuracy = session_accuracy(storage_dict)
+                best_accuracy = accuracy if best_accuracy is None else max(best_accuracy, accuracy)
+    finally:
+        # Chunks written before a failure still count towards the rollup and the caches
+        if stats_inc:
+            await apply_stats_delta(stats_inc, added_accuracy=best_accuracy)
+            await collection_changed("shooting_sessions")
+    
+    created = sum(1 for result in results if result.status == "created")
+    return BulkImportResult(total=len(rows), created=created, failed=len(rows) - created, results=results)
+
 @api_router.get("/sessions", response_model=List[ShootingSession])
-async def get_sessions(limit: int = 50, skip: int = 0):
-    sessions = await db.shooting_sessions.find().skip(skip).limit(limit).sort("date", -1).to_list(limit)
-    result = []
-    for session in sessions:
-        # Convert date string back to date object
-        if isinstance(session['date'], str):
-            session['date'] = datetime.fromisoformat(session['date']).date()
-        result.append(ShootingSession(**session))
-    return result
+async def get_sessions(request: Request, limit: int = 50, skip: int = 0, cursor: Optional[str] = None,
+                       filters: dict = Depends(session_filters),
+                       sort_by: SessionSortField = SessionSortField.DATE,
+                       order: SortOrder = SortOrder.DESC):
+    async def produce():
+        sessions = await find_page(
+            db.shooting_sessions, limit, skip, cursor, SESSION_PROJECTION, filters, sort_by.value, order
+        )
+        return json_response(
+            raw_rows(sessions, SESSION_FIELDS), page_headers(sessions, limit, sort_by.value, order)
+        )
+    return await cached_response("sessions", request, produce)
 
 @api_router.get("/sessions/{session_id}", response_model=ShootingSession)
 async def get_session(session_id: str):
@@ -195,137 +1658,201 @@ async def get_session(session_id: str):
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    # Convert date string back to date object
-    if isinstance(session['date'], str):
-        session['date'] = datetime.fromisoformat(session['date']).date()
+    session['date'] = as_date(session['date'])
     return ShootingSession(**session)
 
 @api_router.put("/sessions/{session_id}", response_model=ShootingSession)
 async def update_session(session_id: str, session_data: ShootingSessionUpdate):
-    update_dict = {k: v for k, v in session_data.dict().items() if v is not None}
-    
-    # Convert date to string if present
-    if 'date' in update_dict:
-        update_dict['date'] = update_dict['date'].isoformat()
-    
-    if not update_dict:
-        raise HTTPException(status_code=400, detail="No data to update")
-    
-    result = await db.shooting_sessions.update_one(
-        {"id": session_id},
-        {"$set": update_dict}
-    )
+    update_dict = partial_update(session_data)
     
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    # Fetch and return updated session
-    updated_session = await db.shooting_sessions.find_one({"id": session_id})
-    if isinstance(updated_session['date'], str):
-        updated_session['date'] = datetime.fromisoformat(updated_session['date']).date()
+    if STATS_FIELDS & update_dict.keys():
+        # Read the previous values atomically so the stats rollup can be adjusted
+        previous = await find_one_and_set(
+            db.shooting_sessions, session_id, update_dict, SESSION_PROJECTION,
+            "Session not found", return_document=ReturnDocument.BEFORE,
+            computed={"accuracy": SESSION_ACCURACY_EXPR}
+        )
+        updated_session = {**previous, **update_dict}
+        updated_session['accuracy'] = session_accuracy(updated_session)
+        await apply_stats_delta(
+            _stats_delta(updated_session, 1, _stats_delta(previous, -1)),
+            added_accuracy=session_accuracy(updated_session),
+            removed_accuracy=session_accuracy(previous)
+        )
+    else:
+        updated_session = await find_one_and_set(
+            db.shooting_sessions, session_id, update_dict, SESSION_PROJECTION, "Session not found"
+        )
+    await collection_changed("shooting_sessions")
+
+    updated_session['date'] = as_date(updated_session['date'])
     return ShootingSession(**updated_session)
 
 @api_router.delete("/sessions/{session_id}")
 async def delete_session(session_id: str):
-    result = await db.shooting_sessions.delete_one({"id": session_id})
-    if result.deleted_count == 0:
+    deleted = await db.shooting_sessions.find_one_and_delete(
+        {"id": session_id},
+        projection={"_id": 0, "total_clays": 1, "clays_hit": 1, "discipline": 1}
+    )
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Session not found")
+    await apply_stats_delta(_stats_delta(deleted, -1), removed_accuracy=session_accuracy(deleted))
+    await collection_changed("shooting_sessions")
     return {"message": "Session deleted successfully"}
 
 @api_router.get("/stats", response_model=SessionStats)
-async def get_stats():
-    sessions = await db.shooting_sessions.find().to_list(1000)
-    
-    if not sessions:
-        return SessionStats(
-            total_sessions=0,
-            total_clays=0,
-            total_hits=0,
-            overall_accuracy=0.0,
-            best_session_accuracy=0.0,
-            current_streak=0,
-            favorite_discipline=""
-        )
-    
-    total_sessions = len(sessions)
-    total_clays = sum(session['total_clays'] for session in sessions)
-    total_hits = sum(session['clays_hit'] for session in sessions)
-    overall_accuracy = (total_hits / total_clays * 100) if total_clays > 0 else 0
-    
-    # Calculate best session accuracy
-    best_accuracy = 0
-    for session in sessions:
-        if session['total_clays'] > 0:
-            accuracy = (session['clays_hit'] / session['total_clays'] * 100)
-            best_accuracy = max(best_accuracy, accuracy)
-    
-    # Find favorite discipline
-    discipline_counts = {}
-    for session in sessions:
-        discipline = session['discipline']
-        discipline_counts[discipline] = discipline_counts.get(discipline, 0) + 1
-    
-    favorite_discipline = max(discipline_counts, key=discipline_counts.get) if discipline_counts else ""
-    
-    # Calculate current streak (consecutive sessions with >80% accuracy)
-    current_streak = 0
-    sorted_sessions = sorted(sessions, key=lambda x: x['date'], reverse=True)
-    for session in sorted_sessions:
-        if session['total_clays'] > 0:
-            accuracy = (session['clays_hit'] / session['total_clays'] * 100)
-            if accuracy >= 80:
-                current_streak += 1
-            else:
-                break
-    
-    return SessionStats(
-        total_sessions=total_sessions,
-        total_clays=total_clays,
-        total_hits=total_hits,
-        overall_accuracy=round(overall_accuracy, 1),
-        best_session_accuracy=round(best_accuracy, 1),
-        current_streak=current_streak,
-        favorite_discipline=favorite_discipline
+async def get_stats(request: Request):
+    async def produce():
+        return json_response((await compute_stats()).model_dump())
+    return await cached_response("stats", request, produce)
+
+@api_router.get("/stats/series", response_model=PerformanceSeries)
+async def get_stats_series(request: Request, bucket: SeriesBucketSize = SeriesBucketSize.DAY,
+                           discipline: Optional[DisciplineType] = None,
+                           start_date: Optional[date] = None,
+                           end_date: Optional[date] = None,
+                           limit: Optional[int] = Query(None, ge=1)):
+    """Hits, clays and sessions per day, week or month, oldest bucket first.
+
+    With a limit only the most recent buckets are returned; the per-discipline
+    totals always cover the whole filtered range.
+    """
+    return await cached_response(
+        "series", request, lambda: compute_stats_series(bucket, discipline, start_date, end_date, limit)
     )
 
-@api_router.get("/sessions/recent/{limit}")
+async def compute_stats_series(bucket: SeriesBucketSize, discipline: Optional[DisciplineType],
+                               start_date: Optional[date], end_date: Optional[date],
+                               limit: Optional[int]) -> Response:
+    query = session_filters(discipline=discipline, start_date=start_date, end_date=end_date)
+    facets = await db.shooting_sessions.aggregate(series_pipeline(query, bucket, limit)).to_list(1)
+    points = [
+        SeriesPoint(
+            bucket=point['_id'],
+            disciplines=sorted(
+                (DisciplineSeries(discipline=d['discipline'], **_series_totals(d)) for d in point['disciplines']),
+                key=lambda d: d.discipline
+            ),
+            **_series_totals(point)
+        )
+        for point in reversed(facets[0]['points'])
+    ]
+    disciplines = [DisciplineSeries(discipline=d['_id'], **_series_totals(d)) for d in facets[0]['disciplines']]
+    with phase_timer("validate"):
+        series = PerformanceSeries(bucket=bucket, points=points, disciplines=disciplines).model_dump()
+    return json_response(series)
+
+@api_router.get("/admin/stats/consistency")
+async def get_stats_consistency():
+    """Compare the stats rollup against a full recompute of shooting_sessions"""
+    return await check_stats_rollup()
+
+@api_router.get("/admin/cache")
+async def get_cache_stats():
+    """Hit, miss and eviction counters for each response cache"""
+    return {
+        "enabled": RESPONSE_CACHE_ENABLED,
+        "caches": {name: cache.stats() for name, cache in RESPONSE_CACHES.items()},
+        "fixture_names": fixture_name_cache.stats(),
+        "invalidation_bus": invalidation_bus.stats(),
+        "collection_versions": collection_versions.stats(),
+        "worker_pid": os.getpid(),
+    }
+
+@api_router.delete("/admin/cache")
+async def clear_caches():
+    for cache in RESPONSE_CACHES.values():
+        cache.invalidate()
+    return {"message": "Caches cleared"}
+
+@api_router.get("/admin/profiles")
+async def list_profiles():
+    """Summaries of the kept slow-request profiles, newest first"""
+    return {
+        "enabled": PROFILER_ENABLED,
+        "threshold_seconds": PROFILER_THRESHOLD_SECONDS,
+        "sample_rate": PROFILER_SAMPLE_RATE,
+        "profiles": [profile.summary() for profile in profile_store.list()],
+    }
+
+@api_router.get("/admin/profiles/{profile_id}")
+async def get_profile(profile_id: int, format: ProfileFormat = ProfileFormat.SPEEDSCOPE):
+    """One profile as speedscope JSON or collapsed stacks"""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == ProfileFormat.COLLAPSED:
+        return Response(profile.collapsed(), media_type="text/plain")
+    return json_response(profile.speedscope())
+
+@api_router.delete("/admin/profiles")
+async def clear_profiles():
+    profile_store.clear()
+    return {"message": "Profiles cleared"}
+
+@api_router.get("/admin/startup")
+async def get_startup_report():
+    """Seconds this worker spent importing, building the app and in each startup phase"""
+    return {"worker_pid": os.getpid(), **startup_report}
+
+@api_router.get("/admin/live")
+async def get_live_update_stats():
+    """Connected live update clients and delivery counters for this worker"""
+    return {"enabled": LIVE_UPDATES_ENABLED, **live_updates.stats()}
+
+@api_router.get("/admin/pool")
+async def get_pool_stats():
+    """Connection pool settings plus open/in-use counts and checkout waits per server"""
+    return {
+        "settings": {**mongo_client_options(), "analyticsReadPreference": MONGO_ANALYTICS_READ_PREFERENCE},
+        "pools": pool_monitor.snapshot(),
+    }
+
+@api_router.get("/admin/indexes")
+async def get_index_stats():
+    """Report index usage for each provisioned collection from $indexStats"""
+    report = {}
+    for collection_name in INDEXES:
+        stats = await db[collection_name].aggregate([{"$indexStats": {}}]).to_list(None)
+        report[collection_name] = [
+            {
+                "name": index['name'],
+                "key": index['key'],
+                "ops": index['accesses']['ops'],
+                "since": index['accesses']['since'],
+            }
+            for index in stats
+        ]
+    return report
+
+@api_router.get("/sessions/recent/{limit}", response_model=List[ShootingSession])
 async def get_recent_sessions(limit: int = 5):
-    sessions = await db.shooting_sessions.find().sort("date", -1).limit(limit).to_list(limit)
-    result = []
-    for session in sessions:
-        if isinstance(session['date'], str):
-            session['date'] = datetime.fromisoformat(session['date']).date()
-        result.append(ShootingSession(**session))
-    return result
+    sessions = await db.shooting_sessions.find({}, SESSION_PROJECTION).sort(LIST_SORT).limit(limit).to_list(limit)
+    return json_response(raw_rows(sessions, SESSION_FIELDS))
 
 # Fixture endpoints
 @api_router.post("/fixtures", response_model=Fixture)
 async def create_fixture(fixture_data: FixtureCreate):
     fixture_dict = fixture_data.dict()
-    # Convert date to string for MongoDB storage
-    fixture_dict['date'] = fixture_dict['date'].isoformat()
     fixture_obj = Fixture(**fixture_dict)
     
-    # Store the dict with string date for MongoDB
     storage_dict = fixture_dict.copy()
+    storage_dict['date'] = to_bson_date(fixture_obj.date)
     storage_dict['id'] = fixture_obj.id
     storage_dict['created_at'] = fixture_obj.created_at
     
     result = await db.fixtures.insert_one(storage_dict)
     if result.inserted_id:
+        await collection_changed("fixtures")
         return fixture_obj
     raise HTTPException(status_code=500, detail="Failed to create fixture")
 
 @api_router.get("/fixtures", response_model=List[Fixture])
-async def get_fixtures(limit: int = 50, skip: int = 0):
-    fixtures = await db.fixtures.find().skip(skip).limit(limit).sort("date", -1).to_list(limit)
-    result = []
-    for fixture in fixtures:
-        # Convert date string back to date object
-        if isinstance(fixture['date'], str):
-            fixture['date'] = datetime.fromisoformat(fixture['date']).date()
-        result.append(Fixture(**fixture))
-    return result
+async def get_fixtures(request: Request, limit: int = 50, skip: int = 0, cursor: Optional[str] = None):
+    async def produce():
+        fixtures = await find_page(db.fixtures, limit, skip, cursor, FIXTURE_PROJECTION)
+        return json_response(raw_rows(fixtures, FIXTURE_FIELDS), page_headers(fixtures, limit))
+    return await cached_response("fixtures", request, produce)
 
 @api_router.get("/fixtures/{fixture_id}", response_model=Fixture)
 async def get_fixture(fixture_id: str):
@@ -333,123 +1860,137 @@ async def get_fixture(fixture_id: str):
     if not fixture:
         raise HTTPException(status_code=404, detail="Fixture not found")
     
-    # Convert date string back to date object
-    if isinstance(fixture['date'], str):
-        fixture['date'] = datetime.fromisoformat(fixture['date']).date()
+    fixture['date'] = as_date(fixture['date'])
     return Fixture(**fixture)
 
 @api_router.put("/fixtures/{fixture_id}", response_model=Fixture)
 async def update_fixture(fixture_id: str, fixture_data: FixtureUpdate):
-    update_dict = {k: v for k, v in fixture_data.dict().items() if v is not None}
-    
-    # Convert date to string if present
-    if 'date' in update_dict:
-        update_dict['date'] = update_dict['date'].isoformat()
-    
-    if not update_dict:
-        raise HTTPException(status_code=400, detail="No data to update")
-    
-    result = await db.fixtures.update_one(
-        {"id": fixture_id},
-        {"$set": update_dict}
+    update_dict = partial_update(fixture_data)
+    updated_fixture = await find_one_and_set(
+        db.fixtures, fixture_id, update_dict, FIXTURE_PROJECTION, "Fixture not found"
     )
-    
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Fixture not found")
-    
-    # Fetch and return updated fixture
-    updated_fixture = await db.fixtures.find_one({"id": fixture_id})
-    if isinstance(updated_fixture['date'], str):
-        updated_fixture['date'] = datetime.fromisoformat(updated_fixture['date']).date()
+    fixture_name_cache.invalidate(fixture_id)
+    await collection_changed("fixtures")
+    if 'name' in update_dict:
+        await propagate_fixture_rename(fixture_id, update_dict['name'])
+    updated_fixture['date'] = as_date(updated_fixture['date'])
     return Fixture(**updated_fixture)
 
 @api_router.delete("/fixtures/{fixture_id}")
-async def delete_fixture(fixture_id: str):
+async def delete_fixture(fixture_id: str, cascade: Optional[FixtureDeletePolicy] = None):
+    """Delete a fixture, applying the cascade policy to its sessions (FIXTURE_DELETE_POLICY by default)"""
+    cascade = cascade or FIXTURE_DELETE_POLICY
+    if cascade == FixtureDeletePolicy.BLOCK:
+        linked = await db.shooting_sessions.count_documents({"fixture_id": fixture_id}, limit=1)
+        if linked:
+            raise HTTPException(status_code=409, detail="Fixture still has sessions linked to it")
+    
     result = await db.fixtures.delete_one({"id": fixture_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Fixture not found")
+    fixture_name_cache.invalidate(fixture_id)
+    await collection_changed("fixtures")
+    
+    if cascade == FixtureDeletePolicy.DELETE:
+        await delete_fixture_sessions(fixture_id)
+    elif cascade == FixtureDeletePolicy.NULLIFY:
+        await unlink_fixture_sessions([fixture_id])
     return {"message": "Fixture deleted successfully"}
 
+# Export endpoints
+@api_router.get("/export/sessions")
+async def export_sessions(format: ExportFormat = ExportFormat.NDJSON,
+                          filters: dict = Depends(session_filters),
+                          sort_by: SessionSortField = SessionSortField.DATE,
+                          order: SortOrder = SortOrder.DESC):
+    """Stream the sessions matching the list filters as NDJSON or CSV"""
+    chunks = stream_export(
+        analytics_db.shooting_sessions, filters, SESSION_PROJECTION, SESSION_FIELDS, format,
+        list_sort(sort_by.value, order)
+    )
+    return export_response("sessions", chunks, format)
+
+@api_router.get("/export/fixtures")
+async def export_fixtures(format: ExportFormat = ExportFormat.NDJSON):
+    """Stream every fixture as NDJSON or CSV, newest first"""
+    chunks = stream_export(analytics_db.fixtures, {}, FIXTURE_PROJECTION, FIXTURE_FIELDS, format, LIST_SORT)
+    return export_response("fixtures", chunks, format)
+
 # Calendar endpoints
 @api_router.get("/calendar/events")
-async def get_calendar_events(start_date: str, end_date: str):
-    """Get all fixtures and sessions within a date range for calendar display"""
+async def get_calendar_events(request: Request, start_date: str, end_date: str, cursor: Optional[str] = None,
+                              limit: int = Query(CALENDAR_PAGE_SIZE, ge=1, le=CALENDAR_MAX_PAGE_SIZE)):
+    """Get all fixtures and sessions within a date range for calendar display.
+
+    Events come in (date, time) order, a page at a time; a full page carries the
+    cursor for the next one in the X-Next-Cursor header.
+    """
     try:
         start = datetime.fromisoformat(start_date).date()
         end = datetime.fromisoformat(end_date).date()
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
-    # Get fixtures in date range
-    fixtures = await db.fixtures.find({
-        "date": {
-            "$gte": start.isoformat(),
-            "$lte": end.isoformat()
-        }
-    }).to_list(1000)
+    return await cached_response(
+        "calendar", request, lambda: calendar_events_page(start, end, cursor, limit)
+    )
+
+async def calendar_events_page(start: date, end: date, cursor: Optional[str], limit: int) -> Response:
+    date_range = {"date": {"$gte": to_bson_date(start), "$lte": to_bson_date(end)}}
     
-    # Get sessions in date range
-    sessions = await db.shooting_sessions.find({
-        "date": {
-            "$gte": start.isoformat(),
-            "$lte": end.isoformat()
-        }
-    }).to_list(1000)
-    
-    # Format fixtures for calendar
-    events = []
-    for fixture in fixtures:
-        if isinstance(fixture['date'], str):
-            fixture['date'] = datetime.fromisoformat(fixture['date']).date()
-        events.append({
-            "id": fixture['id'],
-            "title": fixture['name'],
-            "date": fixture['date'].isoformat(),
-            "time": fixture['time'],
-            "type": "fixture",
-            "discipline": fixture['discipline'],
-            "location": fixture['location'],
-            "description": fixture.get('description', ''),
-            "organizer": fixture.get('organizer', ''),
-            "entry_fee": fixture.get('entry_fee'),
-        })
-    
-    # Format sessions for calendar
-    for session in sessions:
-        if isinstance(session['date'], str):
-            session['date'] = datetime.fromisoformat(session['date']).date()
-        
-        accuracy = (session['clays_hit'] / session['total_clays'] * 100) if session['total_clays'] > 0 else 0
-        
-        events.append({
-            "id": session['id'],
-            "title": f"Session - {session['discipline'].replace('_', ' ').title()}",
-            "date": session['date'].isoformat(),
-            "time": session['time'],
-            "type": "session",
-            "discipline": session['discipline'],
-            "location": session['location'],
-            "accuracy": round(accuracy, 1),
-            "clays_hit": session['clays_hit'],
-            "total_clays": session['total_clays'],
-            "fixture_name": session.get('fixture_name', ''),
-        })
-    
-    # Sort by date and time
-    events.sort(key=lambda x: (x['date'], x['time']))
-    
-    return events
-
-# Include the router in the main app
-app.include_router(api_router)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    def events_query(collection, event_type: str, projection: dict):
+        query = {**date_range, **calendar_after_filter(cursor, event_type)} if cursor else date_range
+        return collection.find(query, projection).sort(CALENDAR_SORT).limit(limit + 1).to_list(limit + 1)
+    
+    # Fixtures and sessions in date range, fetched concurrently and already in calendar order
+    fixtures, sessions = await asyncio.gather(
+        events_query(db.fixtures, "fixture", CALENDAR_FIXTURE_PROJECTION),
+        events_query(db.shooting_sessions, "session", CALENDAR_SESSION_PROJECTION),
+    )
+    
+    merged = heapq.merge(
+        map(fixture_event, fixtures), map(session_event, sessions), key=calendar_event_key
+    )
+    events = list(itertools.islice(merged, limit + 1))
+    headers = {}
+    if len(events) > limit:
+        events = events[:limit]
+        last = events[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_token([last['date'], last['time'], last['type'], last['id']])
+    
+    return json_response(events, headers)
+
+@api_router.get("/live")
+async def live(request: Request):
+    """Server-sent events for session, fixture and stats changes.
+
+    ``session`` and ``fixture`` events carry ``op`` ("upsert" with the row and its calendar
+    event, or "delete" with the id), ``stats`` events the current statistics, and ``resync``
+    asks the client to refetch because deltas were missed.
+    """
+    if not LIVE_UPDATES_ENABLED:
+        raise HTTPException(status_code=404, detail="Live updates are disabled")
+    try:
+        queue = await live_updates.subscribe(db)
+    except LiveUpdatesUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def events():
+        try:
+            async for chunk in event_stream(queue, LIVE_UPDATES_HEARTBEAT_SECONDS):
+                yield chunk
+        finally:
+            live_updates.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def get_metrics():
+    """Prometheus text exposition of the request, phase and Mongo metrics"""
+    body, content_type = metrics_response_body()
+    return Response(body, media_type=content_type)
 
 # Configure logging
 logging.basicConfig(
@@ -458,6 +1999,98 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+background_tasks = set()
+
+# Index provisioning costs a round trip per collection on every start; deployments that run
+# "manage.py ensure-indexes" once per release can turn it off to start replicas faster
+ENSURE_INDEXES_ON_STARTUP = os.environ.get('ENSURE_INDEXES_ON_STARTUP', 'true').lower() in ('1', 'true', 'yes')
+
+# Where this process spent its cold start, reported by /api/admin/startup and logged once
+# the app is ready: module import, create_app() and each lifespan startup phase
+startup_report = {"phases": {}, "ready_seconds": None}
+
+@contextmanager
+def startup_phase(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_report['phases'][name] = round(time.perf_counter() - started, 4)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    with startup_phase("connect"):
+        connect_mongo()
+    with startup_phase("invalidation_bus"):
+        await invalidation_bus.start(db)
+    if ENSURE_INDEXES_ON_STARTUP:
+        with startup_phase("indexes"):
+            await ensure_indexes()
+            if LIVE_UPDATES_ENABLED:
+                await enable_change_stream_pre_images()
+    if FIXTURE_RECONCILE_INTERVAL_SECONDS > 0:
+        task = asyncio.create_task(run_fixture_reconciliation(FIXTURE_RECONCILE_INTERVAL_SECONDS))
+        background_tasks.add(task)
+    if DATE_MIGRATION_ON_STARTUP:
+        # Cheap once done: it only looks for string dates, through the date index
+        background_tasks.add(asyncio.create_task(migrate_dates_in_background()))
+    if ACCURACY_BACKFILL_ON_STARTUP:
+        # Also cheap once done: missing accuracy values are found through the accuracy index
+        background_tasks.add(asyncio.create_task(backfill_accuracy_in_background()))
+    startup_report['ready_seconds'] = round(time.perf_counter() - IMPORT_STARTED, 4)
+    logger.info("Ready %.3fs after import started (%s)", startup_report['ready_seconds'], ", ".join(
+        f"{name} {seconds:.3f}s" for name, seconds in startup_report['phases'].items()
+    ))
+    try:
+        yield
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        await invalidation_bus.stop()
+        await live_updates.stop()
+        close_mongo()
+        mark_worker_stopped()
+
+def create_app() -> FastAPI:
+    """Build the ASGI app; connecting to Mongo and the other startup work happen in its lifespan"""
+    with startup_phase("create_app"):
+        app = FastAPI(lifespan=lifespan)
+        # The /api routes were built when their handlers were defined. include_router() would
+        # rebuild every one of them, re-deriving dependencies and response models, which is a
+        # good share of import time; the routes already carry the prefix, so share them instead
+        app.router.routes.extend(api_router.routes)
+        app.add_api_route("/metrics", get_metrics, include_in_schema=False)
+
+        app.add_middleware(
+            CORSMiddleware,
+            allow_credentials=True,
+            allow_origins=["*"],
+            allow_methods=["*"],
+            allow_headers=["*"],
+            expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
+        )
+
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=COMPRESSION_MINIMUM_SIZE,
+            gzip_level=COMPRESSION_GZIP_LEVEL,
+            brotli_quality=COMPRESSION_BROTLI_QUALITY,
+        )
+
+        if PROFILER_ENABLED:
+            app.add_middleware(
+                ProfilerMiddleware,
+                store=profile_store,
+                threshold_seconds=PROFILER_THRESHOLD_SECONDS,
+                sample_rate=PROFILER_SAMPLE_RATE,
+                interval=PROFILER_INTERVAL_SECONDS,
+            )
+
+        # Outermost, so latency and response sizes cover compression and CORS as well
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+startup_report['phases']['import'] = round(time.perf_counter() - IMPORT_STARTED, 4)
+
+# "server:app" for uvicorn and the tools that import the app directly
+app = create_app()
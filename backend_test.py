@@ -597,6 +597,171 @@ def test_invalid_calendar_dates():
     except Exception as e:
         results.log_fail("Invalid Calendar Date Format", f"Error: {str(e)}")
 
+def test_cursor_pagination():
+    """Keyset pagination: pages follow X-Next-Cursor without overlap, bad cursors are rejected"""
+    try:
+        first = requests.get(f"{API_URL}/sessions", params={"limit": 1}, timeout=10)
+        cursor = first.headers.get("X-Next-Cursor")
+        if first.status_code != 200 or not cursor:
+            results.log_fail("Cursor Pagination", f"No next cursor on a full first page: {first.status_code}")
+            return False
+        second = requests.get(f"{API_URL}/sessions", params={"limit": 1, "cursor": cursor}, timeout=10)
+        if second.status_code != 200 or (second.json() and second.json()[0]["id"] == first.json()[0]["id"]):
+            results.log_fail("Cursor Pagination", f"Second page repeats the first: {second.text}")
+            return False
+        invalid = requests.get(f"{API_URL}/sessions", params={"cursor": "not-a-cursor"}, timeout=10)
+        if invalid.status_code != 400:
+            results.log_fail("Cursor Pagination", f"Invalid cursor answered {invalid.status_code}")
+            return False
+        results.log_pass("Cursor Pagination")
+        return True
+    except Exception as e:
+        results.log_fail("Cursor Pagination", f"Error: {str(e)}")
+    return False
+
+def test_conditional_get():
+    """ETag / If-None-Match: an unchanged list is answered with 304, a write changes the ETag"""
+    try:
+        first = requests.get(f"{API_URL}/fixtures", timeout=10)
+        etag = first.headers.get("ETag")
+        if first.status_code != 200 or not etag:
+            results.log_fail("Conditional GET", f"No ETag on GET /fixtures: {first.status_code}")
+            return False
+        again = requests.get(f"{API_URL}/fixtures", headers={"If-None-Match": etag}, timeout=10)
+        if again.status_code != 304:
+            results.log_fail("Conditional GET", f"Matching If-None-Match answered {again.status_code}")
+            return False
+        created = requests.post(f"{API_URL}/fixtures", json={
+            "name": "ETag Check Shoot", "date": "2024-06-01", "time": "09:00",
+            "location": "Test Ground", "discipline": "trap",
+        }, timeout=10)
+        after_write = requests.get(f"{API_URL}/fixtures", headers={"If-None-Match": etag}, timeout=10)
+        requests.delete(f"{API_URL}/fixtures/{created.json()['id']}", timeout=10)
+        if after_write.status_code != 200 or after_write.headers.get("ETag") == etag:
+            results.log_fail("Conditional GET", f"ETag unchanged after a write: {after_write.status_code}")
+            return False
+        results.log_pass("Conditional GET")
+        return True
+    except Exception as e:
+        results.log_fail("Conditional GET", f"Error: {str(e)}")
+    return False
+
+def test_bulk_import():
+    """Bulk import: valid rows are created, invalid rows are reported by index"""
+    try:
+        rows = [
+            {"date": "2024-05-01", "time": "10:00", "location": "Bulk Ground", "discipline": "trap",
+             "total_clays": 25, "clays_hit": 20},
+            {"date": "2024-05-02", "time": "10:00", "location": "Bulk Ground", "discipline": "archery",
+             "total_clays": 25, "clays_hit": 20},
+        ]
+        response = requests.post(f"{API_URL}/sessions/bulk", json=rows, timeout=10)
+        if response.status_code != 200:
+            results.log_fail("Bulk Import", f"Status code: {response.status_code}, Response: {response.text}")
+            return False
+        data = response.json()
+        for row in data["results"]:
+            if row.get("id"):
+                requests.delete(f"{API_URL}/sessions/{row['id']}", timeout=10)
+        statuses = [row["status"] for row in sorted(data["results"], key=lambda row: row["index"])]
+        if (data["total"], data["created"], data["failed"]) != (2, 1, 1) or statuses != ["created", "error"]:
+            results.log_fail("Bulk Import", f"Unexpected result: {data}")
+            return False
+        results.log_pass("Bulk Import")
+        return True
+    except Exception as e:
+        results.log_fail("Bulk Import", f"Error: {str(e)}")
+    return False
+
+def test_export():
+    """Export: sessions stream as NDJSON and fixtures as CSV with a header row"""
+    try:
+        sessions = requests.get(f"{API_URL}/export/sessions", timeout=10)
+        if sessions.status_code != 200 or not sessions.headers.get("Content-Type", "").startswith("application/x-ndjson"):
+            results.log_fail("Export", f"NDJSON export: {sessions.status_code} {sessions.headers.get('Content-Type')}")
+            return False
+        rows = [json.loads(line) for line in sessions.text.splitlines() if line.strip()]
+        if not rows or any("id" not in row or "_id" in row for row in rows):
+            results.log_fail("Export", f"Unexpected NDJSON rows: {sessions.text[:200]}")
+            return False
+        fixtures = requests.get(f"{API_URL}/export/fixtures", params={"format": "csv"}, timeout=10)
+        if fixtures.status_code != 200 or not fixtures.headers.get("Content-Type", "").startswith("text/csv"):
+            results.log_fail("Export", f"CSV export: {fixtures.status_code} {fixtures.headers.get('Content-Type')}")
+            return False
+        header = fixtures.text.splitlines()[0].split(",")
+        if "id" not in header or "name" not in header:
+            results.log_fail("Export", f"Unexpected CSV header: {header}")
+            return False
+        results.log_pass("Export")
+        return True
+    except Exception as e:
+        results.log_fail("Export", f"Error: {str(e)}")
+    return False
+
+def test_stats_series():
+    """Stats series: buckets come oldest first and add up to the per-discipline totals"""
+    try:
+        response = requests.get(f"{API_URL}/stats/series", params={"bucket": "month"}, timeout=10)
+        if response.status_code != 200:
+            results.log_fail("Stats Series", f"Status code: {response.status_code}, Response: {response.text}")
+            return False
+        data = response.json()
+        buckets = [point["bucket"] for point in data["points"]]
+        if data["bucket"] != "month" or buckets != sorted(buckets) or any(b[8:] != "01" for b in buckets):
+            results.log_fail("Stats Series", f"Unexpected buckets: {buckets}")
+            return False
+        if sum(p["sessions"] for p in data["points"]) != sum(d["sessions"] for d in data["disciplines"]):
+            results.log_fail("Stats Series", f"Points do not add up to the discipline totals: {data}")
+            return False
+        limited = requests.get(f"{API_URL}/stats/series", params={"bucket": "month", "limit": 1}, timeout=10)
+        if limited.status_code != 200 or [p["bucket"] for p in limited.json()["points"]] != buckets[-1:]:
+            results.log_fail("Stats Series", f"limit=1 did not return the latest bucket: {limited.text}")
+            return False
+        results.log_pass("Stats Series")
+        return True
+    except Exception as e:
+        results.log_fail("Stats Series", f"Error: {str(e)}")
+    return False
+
+def test_fixture_delete_cascade():
+    """Fixture delete policies: block refuses, nullify unlinks and delete removes linked sessions"""
+    def linked_pair():
+        fixture = requests.post(f"{API_URL}/fixtures", json={
+            "name": "Cascade Check Shoot", "date": "2024-07-01", "time": "09:00",
+            "location": "Test Ground", "discipline": "skeet",
+        }, timeout=10).json()
+        session = requests.post(f"{API_URL}/sessions", json={
+            "date": "2024-07-01", "time": "09:30", "location": "Test Ground", "discipline": "skeet",
+            "total_clays": 25, "clays_hit": 21, "fixture_id": fixture["id"],
+        }, timeout=10).json()
+        return fixture["id"], session["id"]
+    
+    try:
+        fixture_id, session_id = linked_pair()
+        blocked = requests.delete(f"{API_URL}/fixtures/{fixture_id}", params={"cascade": "block"}, timeout=10)
+        if blocked.status_code != 409:
+            results.log_fail("Fixture Delete Cascade", f"cascade=block answered {blocked.status_code}")
+            return False
+        requests.delete(f"{API_URL}/fixtures/{fixture_id}", params={"cascade": "nullify"}, timeout=10)
+        unlinked = requests.get(f"{API_URL}/sessions/{session_id}", timeout=10)
+        requests.delete(f"{API_URL}/sessions/{session_id}", timeout=10)
+        if unlinked.status_code != 200 or unlinked.json().get("fixture_id") is not None:
+            results.log_fail("Fixture Delete Cascade", f"cascade=nullify left the session linked: {unlinked.text}")
+            return False
+        
+        fixture_id, session_id = linked_pair()
+        requests.delete(f"{API_URL}/fixtures/{fixture_id}", params={"cascade": "delete"}, timeout=10)
+        removed = requests.get(f"{API_URL}/sessions/{session_id}", timeout=10)
+        if removed.status_code != 404:
+            requests.delete(f"{API_URL}/sessions/{session_id}", timeout=10)
+            results.log_fail("Fixture Delete Cascade", f"cascade=delete kept the session: {removed.status_code}")
+            return False
+        results.log_pass("Fixture Delete Cascade")
+        return True
+    except Exception as e:
+        results.log_fail("Fixture Delete Cascade", f"Error: {str(e)}")
+    return False
+
 def main():
     """Run all tests"""
     print("Starting Clay Pigeon Shooting Tracker Backend API Tests")
@@ -668,6 +833,18 @@ def main():
     test_nonexistent_fixture()
     test_invalid_calendar_dates()
     
+    # Performance features: pagination, caching, bulk import, export, series
+    print("\n" + "="*40)
+    print("TESTING PERFORMANCE FEATURES")
+    print("="*40)
+    
+    test_cursor_pagination()
+    test_conditional_get()
+    test_bulk_import()
+    test_export()
+    test_stats_series()
+    test_fixture_delete_cascade()
+    
     # Test 7: Delete sessions (cleanup)
     if session_id_1:
         test_delete_session(session_id_1)
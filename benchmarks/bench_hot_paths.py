@@ -0,0 +1,161 @@
+"""Micro-benchmarks for the per-row serialization and model construction hot paths.
+
+Usage: python -m pytest benchmarks/bench_hot_paths.py [--benchmark-group-by=group]
+
+Needs pytest-benchmark and no database: every benchmark runs over ROWS synthetic
+shooting_sessions rows, so timings are per page and divide by ROWS for per-row cost.
+The file is not named test_*.py, so the regular test run does not pick it up.
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import List
+
+import orjson
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from datetime import date, datetime  # noqa: E402
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+import server  # noqa: E402
+from bench_serialization import build_models, serialize_models  # noqa: E402
+from synthetic import session_documents  # noqa: E402
+
+ROWS = 500
+
+SESSION_LIST = TypeAdapter(List[server.ShootingSession])
+
+
+@pytest.fixture(scope="module")
+def rows() -> List[dict]:
+    """Rows as list reads project them, with YYYY-MM-DD date strings"""
+    return session_documents(ROWS)
+
+
+@pytest.fixture(scope="module")
+def stored_rows(rows) -> List[dict]:
+    """Rows as a single-document read returns them, with BSON dates"""
+    return [{**row, "date": server.to_bson_date(date.fromisoformat(row['date']))} for row in rows]
+
+
+@pytest.fixture(scope="module")
+def models(rows) -> List[server.ShootingSession]:
+    return [server.ShootingSession(**row) for row in rows]
+
+
+@pytest.fixture(scope="module")
+def create_bodies(rows) -> List[dict]:
+    excluded = {"id", "created_at", "accuracy", "fixture_name"}
+    return [{field: value for field, value in row.items() if field not in excluded} for row in rows]
+
+
+@pytest.fixture(scope="module")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def rows_info(request):
+    if "benchmark" in request.fixturenames:
+        request.getfixturevalue("benchmark").extra_info["rows"] = ROWS
+
+
+# Date handling
+@pytest.mark.benchmark(group="dates")
+def test_fromisoformat(benchmark, rows):
+    """The parse every read path used to do on ISO string dates"""
+    benchmark(lambda: [datetime.fromisoformat(row['date']).date() for row in rows])
+
+
+@pytest.mark.benchmark(group="dates")
+def test_as_date_bson(benchmark, stored_rows):
+    benchmark(lambda: [server.as_date(row['date']) for row in stored_rows])
+
+
+@pytest.mark.benchmark(group="dates")
+def test_to_bson_date(benchmark, models):
+    benchmark(lambda: [server.to_bson_date(model.date) for model in models])
+
+
+# Model construction
+@pytest.mark.benchmark(group="models")
+def test_model_from_parsed_date(benchmark, rows):
+    """The original get_sessions loop: parse the date, then build the model"""
+    benchmark(build_models, rows)
+
+
+@pytest.mark.benchmark(group="models")
+def test_model_kwargs(benchmark, rows):
+    benchmark(lambda: [server.ShootingSession(**row) for row in rows])
+
+
+@pytest.mark.benchmark(group="models")
+def test_model_validate(benchmark, rows):
+    benchmark(lambda: [server.ShootingSession.model_validate(row) for row in rows])
+
+
+@pytest.mark.benchmark(group="models")
+def test_model_construct(benchmark, rows):
+    """No validation at all, the floor for any path that still builds models"""
+    benchmark(lambda: [server.ShootingSession.model_construct(**row) for row in rows])
+
+
+@pytest.mark.benchmark(group="models")
+def test_type_adapter_validate(benchmark, rows):
+    benchmark(lambda: SESSION_LIST.validate_python(rows))
+
+
+# Write path
+@pytest.mark.benchmark(group="write")
+def test_create_body_validate(benchmark, create_bodies):
+    benchmark(lambda: [server.ShootingSessionCreate.model_validate(body) for body in create_bodies])
+
+
+@pytest.mark.benchmark(group="write")
+def test_prepare_session(benchmark, create_bodies):
+    data = [server.ShootingSessionCreate.model_validate(body) for body in create_bodies]
+    benchmark(lambda: [server.prepare_session(session, {}) for session in data])
+
+
+# Response serialization
+@pytest.mark.benchmark(group="serialize")
+def test_response_model_pass(benchmark, models, loop):
+    """FastAPI's response_model validation plus its JSONResponse encoding"""
+    benchmark(lambda: loop.run_until_complete(serialize_models(models)))
+
+
+@pytest.mark.benchmark(group="serialize")
+def test_jsonable_encoder(benchmark, models):
+    benchmark(lambda: json.dumps(jsonable_encoder(models)).encode())
+
+
+@pytest.mark.benchmark(group="serialize")
+def test_type_adapter_dump_json(benchmark, models):
+    benchmark(lambda: SESSION_LIST.dump_json(models))
+
+
+@pytest.mark.benchmark(group="serialize")
+def test_raw_rows_orjson(benchmark, rows):
+    """The list endpoints' fast path: projected rows straight to orjson"""
+    benchmark(lambda: orjson.dumps(server.raw_rows(rows, server.SESSION_FIELDS)))
+
+
+@pytest.mark.benchmark(group="serialize")
+def test_json_response(benchmark, rows):
+    benchmark(lambda: server.json_response(server.raw_rows(rows, server.SESSION_FIELDS)).body)
+
+
+def test_fast_path_matches_response_model(rows, models, loop):
+    """The fast path must keep producing what response_model would"""
+    expected = json.loads(loop.run_until_complete(serialize_models(models)))
+    assert orjson.loads(orjson.dumps(server.raw_rows(rows, server.SESSION_FIELDS))) == expected
@@ -0,0 +1,84 @@
+"""Per-row cost of the list endpoint serialization, before and after the raw-document fast path.
+
+Usage: python benchmarks/bench_serialization.py [--rows 500] [--repeat 20]
+
+"before" replays the original get_sessions path: parse each date with
+datetime.fromisoformat, build a ShootingSession per row, then let FastAPI validate
+and serialize the list again through response_model. "after" is the fast path now
+used by the list endpoints: shape the projected documents and encode them with orjson.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+import server  # noqa: E402
+from synthetic import session_documents  # noqa: E402
+
+RESPONSE_FIELD = create_response_field(name="Response_get_sessions", type_=List[server.ShootingSession])
+
+
+def build_models(documents: List[dict]) -> List[server.ShootingSession]:
+    """The original get_sessions loop: parse the date, then build the model"""
+    result = []
+    for session in documents:
+        session = dict(session)
+        if isinstance(session['date'], str):
+            session['date'] = datetime.fromisoformat(session['date']).date()
+        result.append(server.ShootingSession(**session))
+    return result
+
+
+async def serialize_models(models: List[server.ShootingSession]) -> bytes:
+    """FastAPI's response_model validation plus its JSONResponse encoding"""
+    content = await serialize_response(field=RESPONSE_FIELD, response_content=models, is_coroutine=True)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+async def model_path(documents: List[dict]) -> bytes:
+    return await serialize_models(build_models(documents))
+
+
+async def fast_path(documents: List[dict]) -> bytes:
+    return server.json_response(server.raw_rows(documents, server.SESSION_FIELDS)).body
+
+
+async def per_row_seconds(path, documents: List[dict], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await path(documents)
+        best = min(best, time.perf_counter() - started)
+    return best / len(documents)
+
+
+async def main(rows: int, repeat: int):
+    documents = session_documents(rows)
+    before_body = await model_path(documents)
+    after_body = await fast_path(documents)
+    assert json.loads(before_body) == json.loads(after_body), "fast path output differs"
+
+    before = await per_row_seconds(model_path, documents, repeat)
+    after = await per_row_seconds(fast_path, documents, repeat)
+    print(f"rows per page: {rows}, best of {repeat}")
+    print(f"before (models + response_model): {before * 1e6:8.2f} us/row")
+    print(f"after  (raw documents + orjson):  {after * 1e6:8.2f} us/row")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
@@ -0,0 +1,193 @@
+"""Measure cold start: time from launching a fresh process to its first served request.
+
+Usage:
+    python benchmarks/cold_start.py --runs 10 [--mode server|asgi] [--path /api/stats] \
+        [--no-index-provisioning] --output results/cold-start.json [--compare results/baseline.json]
+
+``server`` mode (the default) starts ``manage.py serve`` the way a container would and
+polls --path until it answers 200; the breakdown comes from the worker's
+/api/admin/startup report. ``asgi`` mode skips uvicorn and the network: a child process
+imports the app, runs its lifespan startup and sends one request straight into the ASGI
+app, so it isolates the app's own share of the cold start.
+
+Every run is a new interpreter against the database named by --db-name, which needs no
+seeding (the default path, /api/, does not touch Mongo). Reported per phase are the
+median, min and max over --runs, in seconds; ``total`` is measured from outside the
+process, from spawning it until the first response arrived.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from loadtest import BACKEND_DIR, free_port, git_revision  # noqa: E402
+
+# Run inside the child process with the backend directory as its working directory
+ASGI_CHILD = """
+import asyncio, json, sys, time
+import server
+
+async def first_request(path):
+    sent = []
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        sent.append(message)
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"cold-start")], "server": ("cold-start", 80), "client": ("127.0.0.1", 0),
+    }
+    await server.app(scope, receive, send)
+    return sent[0]["status"]
+
+async def main():
+    async with server.app.router.lifespan_context(server.app):
+        started = time.perf_counter()
+        status = await first_request(sys.argv[1])
+        server.startup_report["phases"]["first_request"] = round(time.perf_counter() - started, 4)
+        print(json.dumps({"status": status, **server.startup_report}), flush=True)
+
+asyncio.run(main())
+"""
+
+
+def child_env(args) -> dict:
+    return {
+        **os.environ,
+        "MONGO_URL": args.mongo_url,
+        "DB_NAME": args.db_name,
+        "FIXTURE_RECONCILE_INTERVAL_SECONDS": "0",
+        "ENSURE_INDEXES_ON_STARTUP": "true" if args.index_provisioning else "false",
+    }
+
+
+def run_asgi(args) -> Dict[str, float]:
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", ASGI_CHILD, args.path],
+        cwd=BACKEND_DIR, env=child_env(args), stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        line = process.stdout.readline()
+        total = time.perf_counter() - started
+    finally:
+        process.wait(args.timeout)
+    if not line:
+        raise SystemExit(f"The child process exited with code {process.returncode} before serving a request")
+    report = json.loads(line)
+    if report['status'] != 200:
+        raise SystemExit(f"GET {args.path} answered {report['status']}")
+    return {**report['phases'], "total": total}
+
+
+def run_server(args) -> Dict[str, float]:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "manage.py", "serve", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=BACKEND_DIR, env=child_env(args),
+    )
+    try:
+        deadline = time.monotonic() + args.timeout
+        while True:
+            if process.poll() is not None:
+                raise SystemExit(f"The server exited with code {process.returncode}")
+            if time.monotonic() > deadline:
+                raise SystemExit(f"The server did not answer within {args.timeout}s")
+            try:
+                if httpx.get(f"{base_url}{args.path}").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            time.sleep(args.poll_interval)
+        total = time.perf_counter() - started
+        phases = httpx.get(f"{base_url}/api/admin/startup").json()['phases']
+    finally:
+        process.terminate()
+        process.wait()
+    return {**phases, "total": total}
+
+
+def summarize(runs: List[Dict[str, float]]) -> Dict[str, dict]:
+    summary = {}
+    for phase in runs[0]:
+        samples = [run[phase] for run in runs if phase in run]
+        summary[phase] = {
+            "median": round(statistics.median(samples), 4),
+            "min": round(min(samples), 4),
+            "max": round(max(samples), 4),
+        }
+    return summary
+
+
+def compare(summary: Dict[str, dict], baseline_path: str):
+    baseline = json.loads(Path(baseline_path).read_text())
+    print(f"\nChange against {baseline['git']['commit'][:12]} ({baseline_path}):")
+    for phase, result in summary.items():
+        before = baseline['summary'].get(phase)
+        if not before or not before['median']:
+            continue
+        change = (result['median'] / before['median'] - 1) * 100
+        print(f"{phase:18} median {change:+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--mode", choices=("server", "asgi"), default="server")
+    parser.add_argument("--path", default="/api/", help="Path of the first request")
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db-name", default="clay_tracker_loadtest")
+    parser.add_argument("--no-index-provisioning", dest="index_provisioning", action="store_false",
+                        help="Start with ENSURE_INDEXES_ON_STARTUP=false")
+    parser.add_argument("--poll-interval", type=float, default=0.01, help="Seconds between readiness polls")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    measure = run_server if args.mode == "server" else run_asgi
+    runs = []
+    for number in range(1, args.runs + 1):
+        runs.append(measure(args))
+        print(f"run {number}/{args.runs}: " + ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in runs[-1].items()))
+
+    summary = summarize(runs)
+    print()
+    for phase, result in summary.items():
+        print(f"{phase:18} median {result['median']:.3f}s  min {result['min']:.3f}s  max {result['max']:.3f}s")
+
+    report = {
+        "git": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "mode": args.mode,
+        "path": args.path,
+        "index_provisioning": args.index_provisioning,
+        "summary": summary,
+        "runs": runs,
+    }
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nWrote {args.output}")
+    if args.compare:
+        compare(summary, args.compare)
+
+
+if __name__ == "__main__":
+    main()
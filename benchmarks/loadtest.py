@@ -0,0 +1,415 @@
+"""Load test every API route against a seeded local mongod.
+
+Usage:
+    python benchmarks/loadtest.py --scale 100k --concurrency 32 --duration 15 \
+        --output results/loadtest-100k.json [--compare results/baseline.json]
+
+The database named by --db-name is dropped and seeded with synthetic sessions and
+fixtures (one fixture per 50 sessions, a fifth of the sessions linked to one), then
+indexes and the stats rollup are built the way the server builds them. Pass --no-seed
+to reuse a database seeded by an earlier run at the same scale.
+
+Unless --base-url points at a running server, ``manage.py serve`` is started on a
+free port against the seeded database, with --workers worker processes. Each route
+then runs on its own for --duration seconds with --concurrency concurrent clients,
+after a short warmup, and the script reports p50/p95/p99 latency and throughput. Results go to --output as JSON together with the
+git commit, so runs on two commits can be compared with --compare.
+
+Write routes add to the seeded data and delete routes only delete what they created
+first, so re-seed (the default) before runs that are meant to be compared.
+DELETE /api/admin/cache and DELETE /api/admin/profiles are left out since they would
+reset the state the other routes are measured with, and so is GET /api/live, an event
+stream that stays open rather than answering a request.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+import httpx
+from pymongo import MongoClient
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import fixture_document, session_document  # noqa: E402
+
+SEED_BATCH_SIZE = 10000
+SESSIONS_PER_FIXTURE = 50
+LINKED_SESSION_FRACTION = 0.2
+SAMPLE_IDS = 1000
+DATA_START = date(2020, 1, 1)
+DATA_DAYS = 1825
+
+
+def parse_scale(value: str) -> int:
+    """Accept plain counts or 1k / 100k / 1m style shorthands"""
+    value = value.strip().lower()
+    multiplier = {"k": 1000, "m": 1000000}.get(value[-1:], 1)
+    return int(float(value.rstrip("km")) * multiplier)
+
+
+def percentile(samples: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of already sorted samples"""
+    if not samples:
+        return None
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def git_revision() -> dict:
+    def git(*args) -> str:
+        return subprocess.run(["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True).stdout.strip()
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+# Seeding
+def stored_session(server, document: dict) -> dict:
+    """Turn a synthetic session row into the document create_session writes"""
+    document['date'] = server.to_bson_date(date.fromisoformat(document['date']))
+    document['accuracy'] = server.session_accuracy(document)
+    return document
+
+
+def stored_fixture(server, document: dict) -> dict:
+    document['date'] = server.to_bson_date(date.fromisoformat(document['date']))
+    return document
+
+
+def seed(server, mongo_url: str, db_name: str, sessions: int, seed_value: int):
+    rng = random.Random(seed_value)
+    db = MongoClient(mongo_url)[db_name]
+    for name in ("shooting_sessions", "fixtures", "session_stats"):
+        db.drop_collection(name)
+
+    fixture_count = max(1, sessions // SESSIONS_PER_FIXTURE)
+    fixtures = [fixture_document(rng, DATA_START, DATA_DAYS) for _ in range(fixture_count)]
+    links = [{"id": fixture['id'], "name": fixture['name'], "discipline": fixture['discipline']} for fixture in fixtures]
+    db.fixtures.insert_many([stored_fixture(server, dict(fixture)) for fixture in fixtures], ordered=False)
+
+    started = time.perf_counter()
+    for offset in range(0, sessions, SEED_BATCH_SIZE):
+        batch = []
+        for _ in range(min(SEED_BATCH_SIZE, sessions - offset)):
+            fixture = rng.choice(links) if rng.random() < LINKED_SESSION_FRACTION else None
+            batch.append(stored_session(server, session_document(rng, DATA_START, DATA_DAYS, fixture)))
+        db.shooting_sessions.insert_many(batch, ordered=False)
+        print(f"  seeded {offset + len(batch)}/{sessions} sessions ({time.perf_counter() - started:.1f}s)", end="\r")
+    print()
+
+    async def provision():
+        await server.ensure_indexes()
+        await server.rebuild_stats_rollup()
+    server.connect_mongo()
+    try:
+        asyncio.run(provision())
+    finally:
+        server.close_mongo()
+
+
+def sample_ids(mongo_url: str, db_name: str) -> dict:
+    db = MongoClient(mongo_url)[db_name]
+    pick = [{"$sample": {"size": SAMPLE_IDS}}, {"$project": {"_id": 0, "id": 1}}]
+    return {
+        "sessions": [document['id'] for document in db.shooting_sessions.aggregate(pick)],
+        "fixtures": [document['id'] for document in db.fixtures.aggregate(pick)],
+    }
+
+
+# Server
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args) -> tuple:
+    port = free_port()
+    env = {
+        **os.environ,
+        "MONGO_URL": args.mongo_url,
+        "DB_NAME": args.db_name,
+        "RESPONSE_CACHE_ENABLED": "true" if args.response_cache else "false",
+        "FIXTURE_RECONCILE_INTERVAL_SECONDS": "0",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "manage.py", "serve", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(args.workers)],
+        cwd=BACKEND_DIR, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"The server exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/api/").status_code == 200:
+                return process, base_url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("The server did not become ready within 30s")
+
+
+# Scenarios. Each builds the request to time; anything it awaits first is setup and untimed
+class Context(NamedTuple):
+    session_ids: List[str]
+    fixture_ids: List[str]
+
+
+Builder = Callable[[httpx.AsyncClient, random.Random, Context], Awaitable[httpx.Request]]
+
+
+def random_day(rng: random.Random) -> date:
+    return DATA_START + timedelta(days=rng.randrange(DATA_DAYS))
+
+
+def new_session(rng: random.Random, ctx: Context) -> dict:
+    body = session_document(rng, DATA_START, DATA_DAYS)
+    for field in ("id", "created_at", "fixture_name"):
+        body.pop(field)
+    body['fixture_id'] = rng.choice(ctx.fixture_ids) if ctx.fixture_ids and rng.random() < LINKED_SESSION_FRACTION else None
+    return body
+
+
+def new_fixture(rng: random.Random) -> dict:
+    body = fixture_document(rng, DATA_START, DATA_DAYS)
+    for field in ("id", "created_at"):
+        body.pop(field)
+    return body
+
+
+def get(path: Callable[[random.Random, Context], str]) -> Builder:
+    async def build(client, rng, ctx):
+        return client.build_request("GET", path(rng, ctx))
+    return build
+
+
+async def create_session(client, rng, ctx):
+    return client.build_request("POST", "/api/sessions", json=new_session(rng, ctx))
+
+
+async def bulk_create_sessions(client, rng, ctx):
+    return client.build_request("POST", "/api/sessions/bulk", json=[new_session(rng, ctx) for _ in range(100)])
+
+
+async def update_session(client, rng, ctx):
+    return client.build_request("PUT", f"/api/sessions/{rng.choice(ctx.session_ids)}",
+                                json={"clays_hit": rng.randint(10, 25), "total_clays": 25})
+
+
+async def delete_session(client, rng, ctx):
+    created = await client.post("/api/sessions", json=new_session(rng, ctx))
+    return client.build_request("DELETE", f"/api/sessions/{created.json()['id']}")
+
+
+async def create_fixture(client, rng, ctx):
+    return client.build_request("POST", "/api/fixtures", json=new_fixture(rng))
+
+
+async def update_fixture(client, rng, ctx):
+    return client.build_request("PUT", f"/api/fixtures/{rng.choice(ctx.fixture_ids)}",
+                                json={"entry_fee": float(rng.choice([35, 50, 75]))})
+
+
+async def delete_fixture(client, rng, ctx):
+    created = await client.post("/api/fixtures", json=new_fixture(rng))
+    return client.build_request("DELETE", f"/api/fixtures/{created.json()['id']}")
+
+
+async def get_profile(client, rng, ctx):
+    # Profiles are only kept with PROFILER_ENABLED and per worker, so without one this times the 404
+    profiles = (await client.get("/api/admin/profiles")).json()['profiles']
+    profile_id = rng.choice(profiles)['id'] if profiles else 0
+    return client.build_request("GET", f"/api/admin/profiles/{profile_id}")
+
+
+def calendar_month(rng: random.Random, ctx: Context) -> str:
+    start = random_day(rng).replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return f"/api/calendar/events?start_date={start}&end_date={end}"
+
+
+# Keyed by the endpoint function names in server.py
+SCENARIOS: Dict[str, Builder] = {
+    "root": get(lambda rng, ctx: "/api/"),
+    "get_sessions": get(lambda rng, ctx: "/api/sessions"),
+    "get_sessions_filtered": get(lambda rng, ctx: (
+        f"/api/sessions?discipline=trap&start_date={random_day(rng)}&sort_by=accuracy&order=desc"
+    )),
+    "get_session": get(lambda rng, ctx: f"/api/sessions/{rng.choice(ctx.session_ids)}"),
+    "get_recent_sessions": get(lambda rng, ctx: "/api/sessions/recent/5"),
+    "create_session": create_session,
+    "bulk_create_sessions": bulk_create_sessions,
+    "update_session": update_session,
+    "delete_session": delete_session,
+    "get_stats": get(lambda rng, ctx: "/api/stats"),
+    "get_stats_series": get(lambda rng, ctx: "/api/stats/series?bucket=week"),
+    "get_fixtures": get(lambda rng, ctx: "/api/fixtures"),
+    "get_fixture": get(lambda rng, ctx: f"/api/fixtures/{rng.choice(ctx.fixture_ids)}"),
+    "create_fixture": create_fixture,
+    "update_fixture": update_fixture,
+    "delete_fixture": delete_fixture,
+    "get_calendar_events": get(calendar_month),
+    "export_sessions": get(lambda rng, ctx: f"/api/export/sessions?start_date={random_day(rng)}"),
+    "export_fixtures": get(lambda rng, ctx: "/api/export/fixtures"),
+    "get_stats_consistency": get(lambda rng, ctx: "/api/admin/stats/consistency"),
+    "get_cache_stats": get(lambda rng, ctx: "/api/admin/cache"),
+    "list_profiles": get(lambda rng, ctx: "/api/admin/profiles"),
+    "get_profile": get_profile,
+    "get_startup_report": get(lambda rng, ctx: "/api/admin/startup"),
+    "get_live_update_stats": get(lambda rng, ctx: "/api/admin/live"),
+    "get_pool_stats": get(lambda rng, ctx: "/api/admin/pool"),
+    "get_index_stats": get(lambda rng, ctx: "/api/admin/indexes"),
+    "get_metrics": get(lambda rng, ctx: "/metrics"),
+}
+
+
+async def run_scenario(client: httpx.AsyncClient, build: Builder, ctx: Context, concurrency: int,
+                       duration: float, seed_value: int) -> dict:
+    latencies: List[float] = []
+    errors: Counter = Counter()
+
+    async def worker(worker_id: int, deadline: float):
+        rng = random.Random(seed_value * 1000 + worker_id)
+        while time.perf_counter() < deadline:
+            try:
+                request = await build(client, rng, ctx)
+                started = time.perf_counter()
+                response = await client.send(request)
+                elapsed = time.perf_counter() - started
+            except httpx.HTTPError as e:
+                errors[type(e).__name__] += 1
+                continue
+            if response.status_code >= 400:
+                errors[str(response.status_code)] += 1
+            else:
+                latencies.append(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i, started + duration) for i in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    to_ms = lambda seconds: None if seconds is None else round(seconds * 1000, 3)
+    return {
+        "requests": len(latencies),
+        "errors": dict(errors),
+        "throughput_rps": round(len(latencies) / wall, 2),
+        "latency_ms": {
+            "p50": to_ms(percentile(latencies, 0.50)),
+            "p95": to_ms(percentile(latencies, 0.95)),
+            "p99": to_ms(percentile(latencies, 0.99)),
+            "mean": to_ms(sum(latencies) / len(latencies)) if latencies else None,
+            "max": to_ms(latencies[-1]) if latencies else None,
+        },
+    }
+
+
+async def run_all(args, base_url: str, ctx: Context, routes: List[str]) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = {}
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        for name in routes:
+            if args.warmup > 0:
+                await run_scenario(client, SCENARIOS[name], ctx, args.concurrency, args.warmup, args.seed)
+            results[name] = await run_scenario(client, SCENARIOS[name], ctx, args.concurrency, args.duration, args.seed)
+            result = results[name]
+            print(f"{name:26} {result['throughput_rps']:>9.1f} req/s  p50 {result['latency_ms']['p50']} ms  "
+                  f"p95 {result['latency_ms']['p95']} ms  p99 {result['latency_ms']['p99']} ms"
+                  + (f"  errors {result['errors']}" if result['errors'] else ""))
+    return results
+
+
+def compare(results: dict, baseline_path: str):
+    baseline = json.loads(Path(baseline_path).read_text())
+    print(f"\nChange against {baseline['git']['commit'][:12]} ({baseline_path}):")
+    for name, result in results.items():
+        before = baseline['results'].get(name)
+        if not before or not before['latency_ms']['p95'] or not result['latency_ms']['p95']:
+            continue
+        p95_change = (result['latency_ms']['p95'] / before['latency_ms']['p95'] - 1) * 100
+        rps_change = (result['throughput_rps'] / before['throughput_rps'] - 1) * 100 if before['throughput_rps'] else 0
+        print(f"{name:26} p95 {p95_change:+7.1f}%  throughput {rps_change:+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=parse_scale, default=parse_scale("1k"), help="Sessions to seed: 1k, 100k, 1m, ...")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per route")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Untimed seconds per route before measuring")
+    parser.add_argument("--routes", default="", help="Comma-separated route names (default: all)")
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db-name", default="clay_tracker_loadtest")
+    parser.add_argument("--no-seed", dest="seed_data", action="store_false")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for data and requests")
+    parser.add_argument("--base-url", help="Test a running server instead of starting one")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for the started server")
+    parser.add_argument("--no-response-cache", dest="response_cache", action="store_false",
+                        help="Start the server with RESPONSE_CACHE_ENABLED=false")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    routes = [name.strip() for name in args.routes.split(",") if name.strip()] or list(SCENARIOS)
+    unknown = set(routes) - SCENARIOS.keys()
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(sorted(unknown))}")
+
+    # server reads its database from the environment when connecting
+    os.environ["MONGO_URL"] = args.mongo_url
+    os.environ["DB_NAME"] = args.db_name
+    import server
+
+    if args.seed_data:
+        print(f"Seeding {args.scale} sessions into {args.db_name}")
+        seed(server, args.mongo_url, args.db_name, args.scale, args.seed)
+    ids = sample_ids(args.mongo_url, args.db_name)
+    ctx = Context(session_ids=ids['sessions'], fixture_ids=ids['fixtures'])
+
+    process = None
+    base_url = args.base_url
+    if base_url is None:
+        process, base_url = start_server(args)
+    try:
+        results = asyncio.run(run_all(args, base_url, ctx, routes))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    report = {
+        "git": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": args.scale,
+        "concurrency": args.concurrency,
+        "duration_seconds": args.duration,
+        "workers": args.workers if args.base_url is None else None,
+        "response_cache": args.response_cache if args.base_url is None else None,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nWrote {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
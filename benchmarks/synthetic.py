@@ -0,0 +1,68 @@
+"""Synthetic shooting_sessions and fixtures rows as list endpoints read them.
+
+Dates are YYYY-MM-DD strings, the shape SESSION_PROJECTION and FIXTURE_PROJECTION
+return; in the collections themselves they are BSON dates.
+"""
+import random
+import uuid
+from datetime import date, datetime, timedelta
+
+DISCIPLINES = ["trap", "skeet", "sporting_clays", "down_the_line", "olympic_trap", "american_trap"]
+WEATHER = ["sunny", "cloudy", "windy", "rainy", "overcast", None]
+LOCATIONS = ["Werribee Clay Club", "Sydney Olympic Park", "Brisbane SSAA", "Adelaide Gun Club", "Perth Clay Target Club"]
+GUNS = ["Beretta 694", "Browning 725", "Perazzi MX8", "Miroku MK70", None]
+
+
+def session_document(rng: random.Random, start: date = date(2020, 1, 1), days: int = 1825,
+                     fixture: dict = None) -> dict:
+    """A shooting_sessions document as list reads project it."""
+    total_clays = rng.choice([25, 50, 75, 100])
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "date": (start + timedelta(days=rng.randrange(days))).isoformat(),
+        "time": f"{rng.randrange(7, 18):02d}:{rng.choice(['00', '15', '30', '45'])}",
+        "location": rng.choice(LOCATIONS),
+        "discipline": fixture['discipline'] if fixture else rng.choice(DISCIPLINES),
+        "total_clays": total_clays,
+        "clays_hit": rng.randint(total_clays // 2, total_clays),
+        "weather": rng.choice(WEATHER),
+        "temperature": rng.randint(5, 40),
+        "wind_speed": rng.choice(["calm", "light", "moderate", "strong", None]),
+        "gun_used": rng.choice(GUNS),
+        "cartridge_type": rng.choice(["Winchester AA 28g", "Gamebore 24g", None]),
+        "choke_used": rng.choice(["1/4", "1/2", "3/4", "full", None]),
+        "notes": rng.choice(["Good morning round", "Struggled on the high house", None]),
+        "fixture_id": fixture['id'] if fixture else None,
+        "fixture_name": fixture['name'] if fixture else None,
+        "created_at": datetime(2020, 1, 1) + timedelta(milliseconds=rng.randrange(10 ** 11)),
+    }
+
+
+def fixture_document(rng: random.Random, start: date = date(2020, 1, 1), days: int = 1825) -> dict:
+    """A fixtures document as list reads project it."""
+    discipline = rng.choice(DISCIPLINES)
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "name": f"{rng.choice(LOCATIONS)} {discipline.replace('_', ' ').title()} Open",
+        "description": rng.choice(["State selection shoot", "Club championship", None]),
+        "date": (start + timedelta(days=rng.randrange(days))).isoformat(),
+        "time": f"{rng.randrange(7, 12):02d}:00",
+        "location": rng.choice(LOCATIONS),
+        "discipline": discipline,
+        "max_participants": rng.choice([40, 60, 120, None]),
+        "entry_fee": rng.choice([35.0, 50.0, 75.0, None]),
+        "organizer": rng.choice(["ACTA", "SSAA", None]),
+        "contact_info": None,
+        "notes": None,
+        "created_at": datetime(2020, 1, 1) + timedelta(milliseconds=rng.randrange(10 ** 11)),
+    }
+
+
+def session_documents(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [session_document(rng) for _ in range(count)]
+
+
+def fixture_documents(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [fixture_document(rng) for _ in range(count)]
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import "./App.css";
 import { BrowserRouter, Routes, Route, Navigate } from "react-router-dom";
 import axios from "axios";
@@ -8,6 +8,7 @@ import Calendar from "./components/Calendar";
 import SessionHistory from "./components/SessionHistory";
 import Statistics from "./components/Statistics";
 import Navigation from "./components/Navigation";
+import { subscribeLive, applySessionChange } from "./liveUpdates";
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
@@ -16,6 +17,12 @@ function App() {
   const [sessions, setSessions] = useState([]);
   const [stats, setStats] = useState(null);
   const [loading, setLoading] = useState(true);
+  // While live updates are connected the server pushes fresh stats after every write
+  const liveConnected = useRef(false);
+
+  const refreshStats = async () => {
+    if (!liveConnected.current) await fetchStats();
+  };
 
   const fetchSessions = async () => {
     try {
@@ -39,7 +46,7 @@ function App() {
     try {
       const response = await axios.post(`${API}/sessions`, sessionData);
       setSessions(prev => [response.data, ...prev]);
-      await fetchStats(); // Refresh stats
+      await refreshStats();
       return response.data;
     } catch (error) {
       console.error("Error adding session:", error);
@@ -55,7 +62,7 @@ function App() {
           session.id === sessionId ? response.data : session
         )
       );
-      await fetchStats(); // Refresh stats
+      await refreshStats();
       return response.data;
     } catch (error) {
       console.error("Error updating session:", error);
@@ -67,7 +74,7 @@ function App() {
     try {
       await axios.delete(`${API}/sessions/${sessionId}`);
       setSessions(prev => prev.filter(session => session.id !== sessionId));
-      await fetchStats(); // Refresh stats
+      await refreshStats();
     } catch (error) {
       console.error("Error deleting session:", error);
       throw error;
@@ -82,6 +89,13 @@ function App() {
     loadData();
   }, []);
 
+  useEffect(() => subscribeLive({
+    session: change => setSessions(prev => applySessionChange(prev, change)),
+    stats: event => setStats(event.data),
+    resync: () => Promise.all([fetchSessions(), fetchStats()]),
+    onStatus: connected => { liveConnected.current = connected; },
+  }), []);
+
   if (loading) {
     return (
       <div className="min-h-screen flex items-center justify-center bg-gray-50">
@@ -116,7 +130,6 @@ function App() {
                 path="/history" 
                 element={
                   <SessionHistory 
-                    sessions={sessions} 
                     onUpdateSession={updateSession}
                     onDeleteSession={deleteSession}
                   />
@@ -124,7 +137,7 @@ function App() {
               />
               <Route 
                 path="/statistics" 
-                element={<Statistics sessions={sessions} stats={stats} />} 
+                element={<Statistics stats={stats} />} 
               />
               <Route path="*" element={<Navigate to="/" replace />} />
             </Routes>
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import CreateFixture from './CreateFixture';
 import AdSection, { sampleAds } from './AdSection';
+import { subscribeLive, applyCalendarChange } from '../liveUpdates';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
@@ -21,19 +22,31 @@ const Calendar = () => {
 
   const dayNames = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat'];
 
+  const monthRange = () => {
+    const year = currentDate.getFullYear();
+    const month = currentDate.getMonth();
+    return [
+      new Date(year, month, 1).toISOString().split('T')[0],
+      new Date(year, month + 1, 0).toISOString().split('T')[0],
+    ];
+  };
+
   const fetchEvents = async () => {
     try {
       setLoading(true);
-      const year = currentDate.getFullYear();
-      const month = currentDate.getMonth();
-      
-      const startDate = new Date(year, month, 1).toISOString().split('T')[0];
-      const endDate = new Date(year, month + 1, 0).toISOString().split('T')[0];
+      const [startDate, endDate] = monthRange();
       
-      const response = await axios.get(`${API}/calendar/events`, {
-        params: { start_date: startDate, end_date: endDate }
-      });
-      setEvents(response.data);
+      // Busy months can span several pages; follow the cursor until the month is complete
+      const monthEvents = [];
+      let cursor = null;
+      do {
+        const params = { start_date: startDate, end_date: endDate };
+        if (cursor) params.cursor = cursor;
+        const response = await axios.get(`${API}/calendar/events`, { params });
+        monthEvents.push(...response.data);
+        cursor = response.headers['x-next-cursor'] || null;
+      } while (cursor);
+      setEvents(monthEvents);
     } catch (error) {
       console.error('Error fetching calendar events:', error);
     } finally {
@@ -61,6 +74,24 @@ const Calendar = () => {
     fetchFixtures();
   }, [currentDate]);
 
+  useEffect(() => {
+    const [startDate, endDate] = monthRange();
+    const applyChange = change => setEvents(prev => applyCalendarChange(prev, change, startDate, endDate));
+    return subscribeLive({
+      session: applyChange,
+      fixture: change => {
+        applyChange(change);
+        setFixtures(prev => change.op === 'delete'
+          ? prev.filter(fixture => fixture.id !== change.id)
+          : [change.data, ...prev.filter(fixture => fixture.id !== change.id)]);
+      },
+      resync: () => {
+        fetchEvents();
+        fetchFixtures();
+      },
+    });
+  }, [currentDate]);
+
   const getDaysInMonth = (date) => {
     const year = date.getFullYear();
     const month = date.getMonth();
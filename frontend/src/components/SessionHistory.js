@@ -1,6 +1,14 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
+import axios from 'axios';
 
-const SessionHistory = ({ sessions, onUpdateSession, onDeleteSession }) => {
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+const API = `${BACKEND_URL}/api`;
+const PAGE_SIZE = 50;
+
+const SessionHistory = ({ onUpdateSession, onDeleteSession }) => {
+  const [sessions, setSessions] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loading, setLoading] = useState(true);
   const [filterDiscipline, setFilterDiscipline] = useState('');
   const [sortBy, setSortBy] = useState('date');
   const [sortOrder, setSortOrder] = useState('desc');
@@ -34,31 +42,33 @@ const SessionHistory = ({ sessions, onUpdateSession, onDeleteSession }) => {
     return 'badge badge-low';
   };
 
-  const filteredAndSortedSessions = sessions
-    .filter(session => !filterDiscipline || session.discipline === filterDiscipline)
-    .sort((a, b) => {
-      let aValue = a[sortBy];
-      let bValue = b[sortBy];
-
-      if (sortBy === 'accuracy') {
-        aValue = a.total_clays > 0 ? (a.clays_hit / a.total_clays) * 100 : 0;
-        bValue = b.total_clays > 0 ? (b.clays_hit / b.total_clays) * 100 : 0;
-      } else if (sortBy === 'date') {
-        aValue = new Date(aValue);
-        bValue = new Date(bValue);
-      }
+  // Filtering and sorting happen server-side; further pages are fetched with the keyset cursor
+  const fetchSessions = async (cursor = null) => {
+    try {
+      setLoading(true);
+      const params = { limit: PAGE_SIZE, sort_by: sortBy, order: sortOrder };
+      if (filterDiscipline) params.discipline = filterDiscipline;
+      if (cursor) params.cursor = cursor;
+
+      const response = await axios.get(`${API}/sessions`, { params });
+      setSessions(prev => (cursor ? [...prev, ...response.data] : response.data));
+      setNextCursor(response.headers['x-next-cursor'] || null);
+    } catch (error) {
+      console.error('Error fetching sessions:', error);
+    } finally {
+      setLoading(false);
+    }
+  };
 
-      if (sortOrder === 'desc') {
-        return bValue > aValue ? 1 : -1;
-      } else {
-        return aValue > bValue ? 1 : -1;
-      }
-    });
+  useEffect(() => {
+    fetchSessions();
+  }, [filterDiscipline, sortBy, sortOrder]);
 
   const handleDelete = async (sessionId) => {
     if (window.confirm('Are you sure you want to delete this session?')) {
       try {
         await onDeleteSession(sessionId);
+        setSessions(prev => prev.filter(session => session.id !== sessionId));
       } catch (error) {
         alert('Error deleting session. Please try again.');
       }
@@ -75,7 +85,8 @@ const SessionHistory = ({ sessions, onUpdateSession, onDeleteSession }) => {
   const handleSaveEdit = async (e) => {
     e.preventDefault();
     try {
-      await onUpdateSession(editingSession.id, editingSession);
+      const updated = await onUpdateSession(editingSession.id, editingSession);
+      setSessions(prev => prev.map(session => (session.id === updated.id ? updated : session)));
       setEditingSession(null);
     } catch (error) {
       alert('Error updating session. Please try again.');
@@ -133,6 +144,7 @@ const SessionHistory = ({ sessions, onUpdateSession, onDeleteSession }) => {
             >
               <option value="date">Date</option>
               <option value="accuracy">Accuracy</option>
+              <option value="clays_hit">Clays Hit</option>
               <option value="location">Location</option>
               <option value="discipline">Discipline</option>
             </select>
@@ -154,9 +166,9 @@ const SessionHistory = ({ sessions, onUpdateSession, onDeleteSession }) => {
         </div>
 
         {/* Sessions List */}
-        {filteredAndSortedSessions.length > 0 ? (
+        {sessions.length > 0 ? (
           <div className="space-y-4">
-            {filteredAndSortedSessions.map((session) => {
+            {sessions.map((session) => {
               const accuracy = session.total_clays > 0 
                 ? Math.round((session.clays_hit / session.total_clays) * 100) 
                 : 0;
@@ -235,6 +247,22 @@ const SessionHistory = ({ sessions, onUpdateSession, onDeleteSession }) => {
                 </div>
               );
             })}
+
+            {nextCursor && (
+              <div className="text-center pt-2">
+                <button
+                  onClick={() => fetchSessions(nextCursor)}
+                  className="btn-secondary"
+                  disabled={loading}
+                >
+                  {loading ? 'Loading...' : 'Load more sessions'}
+                </button>
+              </div>
+            )}
+          </div>
+        ) : loading ? (
+          <div className="text-center py-12">
+            <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-orange-500 mx-auto"></div>
           </div>
         ) : (
           <div className="text-center py-12">
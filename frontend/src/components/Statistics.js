@@ -1,41 +1,37 @@
-import React, { useMemo } from 'react';
-
-const Statistics = ({ sessions, stats }) => {
-  const chartData = useMemo(() => {
-    // Group sessions by date for performance chart
-    const sessionsByDate = sessions.reduce((acc, session) => {
-      const date = new Date(session.date).toISOString().split('T')[0];
-      if (!acc[date]) {
-        acc[date] = { totalClays: 0, hits: 0, sessions: 0 };
-      }
-      acc[date].totalClays += session.total_clays;
-      acc[date].hits += session.clays_hit;
-      acc[date].sessions += 1;
-      return acc;
-    }, {});
-
-    const performanceData = Object.entries(sessionsByDate)
-      .map(([date, data]) => ({
-        date,
-        accuracy: data.totalClays > 0 ? (data.hits / data.totalClays) * 100 : 0,
-        sessions: data.sessions
-      }))
-      .sort((a, b) => new Date(a.date) - new Date(b.date))
-      .slice(-10); // Last 10 sessions
-
-    // Group by discipline
-    const disciplineStats = sessions.reduce((acc, session) => {
-      if (!acc[session.discipline]) {
-        acc[session.discipline] = { sessions: 0, totalClays: 0, hits: 0 };
+import React, { useState, useEffect } from 'react';
+import axios from 'axios';
+
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+const API = `${BACKEND_URL}/api`;
+
+const Statistics = ({ stats }) => {
+  const [chartData, setChartData] = useState({ performanceData: [], disciplineStats: {} });
+
+  useEffect(() => {
+    // Grouping by day and discipline is done server-side, so the payload stays small
+    const fetchSeries = async () => {
+      try {
+        const response = await axios.get(`${API}/stats/series`, {
+          params: { bucket: 'day', limit: 10 }
+        });
+        const performanceData = response.data.points.map(point => ({
+          date: point.bucket,
+          accuracy: point.accuracy,
+          sessions: point.sessions
+        }));
+        const disciplineStats = Object.fromEntries(
+          response.data.disciplines.map(data => [
+            data.discipline,
+            { sessions: data.sessions, totalClays: data.total_clays, hits: data.clays_hit }
+          ])
+        );
+        setChartData({ performanceData, disciplineStats });
+      } catch (error) {
+        console.error('Error fetching performance series:', error);
       }
-      acc[session.discipline].sessions += 1;
-      acc[session.discipline].totalClays += session.total_clays;
-      acc[session.discipline].hits += session.clays_hit;
-      return acc;
-    }, {});
-
-    return { performanceData, disciplineStats };
-  }, [sessions]);
+    };
+    fetchSeries();
+  }, [stats]);
 
   const formatDiscipline = (discipline) => {
     const disciplineMap = {
@@ -89,7 +85,7 @@ const Statistics = ({ sessions, stats }) => {
         <p className="text-gray-600 text-lg">Analyze your clay pigeon shooting progress</p>
       </div>
 
-      {sessions.length === 0 ? (
+      {!stats || stats.total_sessions === 0 ? (
         <div className="bg-white rounded-2xl shadow-lg p-12 text-center">
           <div className="text-6xl mb-4">📊</div>
           <h3 className="text-xl font-semibold text-gray-600 mb-2">
@@ -168,7 +164,7 @@ const Statistics = ({ sessions, stats }) => {
                   ))}
                 </div>
                 <div className="text-center text-sm text-gray-500">
-                  Last {chartData.performanceData.length} shooting sessions
+                  Last {chartData.performanceData.length} shooting days
                 </div>
               </div>
             ) : (
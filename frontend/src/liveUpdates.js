@@ -0,0 +1,85 @@
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+const API = `${BACKEND_URL}/api`;
+
+const LIVE_EVENT_TYPES = ['session', 'fixture', 'stats', 'resync'];
+
+// One /api/live connection shared by every subscriber: opened by the first, closed with the last
+const subscribers = new Set();
+let source = null;
+let connected = false;
+
+const notify = (type, payload) => {
+  subscribers.forEach(handlers => {
+    if (handlers[type]) handlers[type](payload);
+  });
+};
+
+const openSource = () => {
+  source = new EventSource(`${API}/live`);
+  let opened = false;
+
+  LIVE_EVENT_TYPES.forEach(type => {
+    source.addEventListener(type, (message) => notify(type, JSON.parse(message.data)));
+  });
+
+  source.onopen = () => {
+    if (opened) notify('resync', { type: 'resync' });
+    opened = true;
+    connected = true;
+    notify('onStatus', true);
+  };
+
+  // The browser retries on its own; a 503 (no change streams on the server) closes the source
+  source.onerror = () => {
+    connected = false;
+    notify('onStatus', false);
+  };
+};
+
+// Subscribe to /api/live server-sent events. `handlers` maps event types (session, fixture,
+// stats, resync) to callbacks and may include onStatus(connected). After a reconnect
+// deltas may have been missed, so resync is called as well. Returns an unsubscribe function.
+export const subscribeLive = (handlers) => {
+  if (typeof EventSource === 'undefined') return () => {};
+
+  subscribers.add(handlers);
+  if (source === null) openSource();
+  else if (connected && handlers.onStatus) handlers.onStatus(true);
+
+  return () => {
+    subscribers.delete(handlers);
+    if (subscribers.size === 0 && source !== null) {
+      source.close();
+      source = null;
+      connected = false;
+    }
+  };
+};
+
+// Newest first, as /api/sessions returns them
+const compareSessions = (a, b) =>
+  b.date.localeCompare(a.date) ||
+  String(b.created_at).localeCompare(String(a.created_at)) ||
+  b.id.localeCompare(a.id);
+
+export const applySessionChange = (sessions, change) => {
+  const others = sessions.filter(session => session.id !== change.id);
+  if (change.op === 'delete') return others;
+  return [...others, change.data].sort(compareSessions);
+};
+
+// Calendar order, as /api/calendar/events returns it: date, time, fixtures before sessions, id
+const CALENDAR_EVENT_TYPES = ['fixture', 'session'];
+
+const compareEvents = (a, b) =>
+  a.date.localeCompare(b.date) ||
+  a.time.localeCompare(b.time) ||
+  CALENDAR_EVENT_TYPES.indexOf(a.type) - CALENDAR_EVENT_TYPES.indexOf(b.type) ||
+  a.id.localeCompare(b.id);
+
+export const applyCalendarChange = (events, change, startDate, endDate) => {
+  const others = events.filter(event => !(event.type === change.type && event.id === change.id));
+  if (change.op === 'delete') return others;
+  if (change.event.date < startDate || change.event.date > endDate) return others;
+  return [...others, change.event].sort(compareEvents);
+};
@@ -0,0 +1,9 @@
+"""Unit tests for backend helpers that need no database or running server.
+
+``backend_test.py`` at the repository root exercises the API end to end against a
+deployed backend; these cover the pieces that can be checked in isolation.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
@@ -0,0 +1,27 @@
+"""A tiny evaluator for the Mongo query subset the range filters use: $or, $and,
+equality and $lt/$gt/$lte/$gte/$ne. Like Mongo, a null or missing value only matches
+equality with None (or $ne against anything else) and never a range operator."""
+
+OPERATORS = {
+    "$lt": lambda value, bound: value is not None and value < bound,
+    "$gt": lambda value, bound: value is not None and value > bound,
+    "$lte": lambda value, bound: value is not None and value <= bound,
+    "$gte": lambda value, bound: value is not None and value >= bound,
+    "$ne": lambda value, bound: value != bound,
+}
+
+
+def matches(document: dict, query: dict) -> bool:
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(matches(document, clause) for clause in condition):
+                return False
+        elif field == "$and":
+            if not all(matches(document, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            if not all(OPERATORS[op](document.get(field), bound) for op, bound in condition.items()):
+                return False
+        elif document.get(field) != condition:
+            return False
+    return True
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import server
+
+CSV = "date,time,location,discipline,total_clays,clays_hit\n2024-03-05,10:00,Smørgrav,trap,25,20\n"
+
+
+def request(body: bytes, content_type: str) -> Request:
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+    return Request({
+        "type": "http", "method": "POST", "path": "/api/sessions/bulk", "query_string": b"",
+        "headers": [(b"content-type", content_type.encode())],
+    }, receive)
+
+
+def parse(body: bytes, content_type: str):
+    return asyncio.run(server.parse_bulk_rows(request(body, content_type)))
+
+
+@pytest.mark.parametrize("body", [CSV.encode(), b"\xef\xbb\xbf" + CSV.encode()])
+def test_utf8_csv_with_or_without_a_bom(body):
+    [row] = parse(body, "text/csv")
+    assert row['date'] == "2024-03-05" and row['location'] == "Smørgrav"
+
+
+def test_declared_charset_is_used():
+    [row] = parse(CSV.encode("cp1252"), "text/csv; charset=windows-1252")
+    assert row['location'] == "Smørgrav"
+
+
+@pytest.mark.parametrize("content_type", ["text/csv", "text/csv; charset=no-such-charset"])
+def test_undecodable_body_is_a_bad_request(content_type):
+    with pytest.raises(HTTPException) as error:
+        parse(CSV.encode("cp1252"), content_type)
+    assert error.value.status_code == 400
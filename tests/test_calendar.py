@@ -0,0 +1,111 @@
+import asyncio
+import random
+from datetime import date, timedelta
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+import server
+from tests.filters import matches
+
+MONTH_START = date(2024, 3, 1)
+MONTH_END = date(2024, 3, 31)
+
+
+class FakeFind:
+    def __init__(self, documents: list):
+        self.documents = documents
+
+    def sort(self, keys: list):
+        for field, direction in reversed(keys):
+            self.documents.sort(key=lambda document: document[field], reverse=direction < 0)
+        return self
+
+    def limit(self, count: int):
+        self.documents = self.documents[:count]
+        return self
+
+    async def to_list(self, length):
+        return self.documents
+
+
+class FakeCollection:
+    """Just enough of a Motor collection for calendar_events_page"""
+
+    def __init__(self, documents: list):
+        self.documents = documents
+
+    def find(self, query: dict, projection: dict):
+        found = [document for document in self.documents if matches(document, query)]
+        # The projection formats the BSON date as YYYY-MM-DD inside Mongo
+        return FakeFind([{**document, "date": document['date'].strftime("%Y-%m-%d")} for document in found])
+
+
+def stored_events(rng: random.Random, prefix: str, count: int, **fields) -> list:
+    return [
+        {
+            "id": f"{prefix}-{index:03d}",
+            "date": server.to_bson_date(MONTH_START + timedelta(days=rng.randrange(-3, 34))),
+            "time": rng.choice(["09:00", "10:00"]),
+            "discipline": "trap",
+            "location": "Range",
+            **fields,
+        }
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+def calendar_db(monkeypatch):
+    rng = random.Random(7)
+    db = type("FakeDB", (), {})()
+    db.fixtures = FakeCollection(stored_events(rng, "fixture", 25, name="Open"))
+    db.shooting_sessions = FakeCollection(stored_events(rng, "session", 60, clays_hit=20, total_clays=25))
+    monkeypatch.setattr(server, "db", db)
+    return db
+
+
+def read_page(cursor, limit: int):
+    response = asyncio.run(server.calendar_events_page(MONTH_START, MONTH_END, cursor, limit))
+    return orjson.loads(response.body), response.headers.get(server.NEXT_CURSOR_HEADER)
+
+
+def expected_keys(db) -> list:
+    in_month = lambda document: MONTH_START <= document['date'].date() <= MONTH_END  # noqa: E731
+    keys = [(d['date'].strftime("%Y-%m-%d"), d['time'], 0, d['id']) for d in db.fixtures.documents if in_month(d)]
+    keys += [(d['date'].strftime("%Y-%m-%d"), d['time'], 1, d['id'])
+             for d in db.shooting_sessions.documents if in_month(d)]
+    return sorted(keys)
+
+
+@pytest.mark.parametrize("limit", [1, 4, 10, 1000])
+def test_pages_merge_both_collections_in_calendar_order(calendar_db, limit):
+    seen, cursor = [], None
+    while True:
+        events, cursor = read_page(cursor, limit)
+        assert len(events) <= limit
+        seen.extend(server.calendar_event_key(event) for event in events)
+        if cursor is None:
+            break
+    assert seen == expected_keys(calendar_db)
+
+
+def test_fixtures_come_before_sessions_at_the_same_time():
+    fixture = {"date": "2024-03-05", "time": "09:00", "type": "fixture", "id": "zzz"}
+    session = {"date": "2024-03-05", "time": "09:00", "type": "session", "id": "aaa"}
+    assert server.calendar_event_key(fixture) < server.calendar_event_key(session)
+
+
+def test_cursor_after_a_session_skips_fixtures_at_that_time():
+    cursor = server.encode_token(["2024-03-05", "09:00", "session", "session-010"])
+    after = server.calendar_after_filter(cursor, "fixture")
+    at_same_time = {"date": server.to_bson_date(date(2024, 3, 5)), "time": "09:00", "id": "fixture-999"}
+    assert not matches(at_same_time, after)
+
+
+@pytest.mark.parametrize("cursor", ["garbage", server.encode_token(["2024-03-05", "09:00", "party", "x"])])
+def test_malformed_calendar_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        server.calendar_after_filter(cursor, "session")
+    assert error.value.status_code == 400
@@ -0,0 +1,55 @@
+import gzip
+
+import pytest
+
+import compression
+from compression import compress, is_compressible, negotiate_encoding, weaken_etag
+
+
+@pytest.fixture
+def without_brotli(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip, deflate, br", "br"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("BR, GZIP", "br"),
+    ("gzip;q=0", None),
+    ("*", "br"),
+    ("*;q=0.1, br;q=0", "gzip"),
+    ("gzip;q=abc, br;q=0", None),
+    (" , gzip ;  q=0.8", "gzip"),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    pytest.importorskip("brotli")
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+def test_brotli_is_never_picked_without_the_module(without_brotli):
+    assert negotiate_encoding("br") is None
+    assert negotiate_encoding("br, gzip") == "gzip"
+    assert negotiate_encoding("*") == "gzip"
+
+
+def test_gzip_round_trip():
+    body = b'{"sessions": []}' * 100
+    assert gzip.decompress(compress(body, "gzip")) == body
+
+
+@pytest.mark.parametrize("content_type, expected", [
+    ("application/json", True),
+    ("text/csv; charset=utf-8", True),
+    ("text/event-stream; charset=utf-8", False),
+    ("image/png", False),
+])
+def test_is_compressible(content_type, expected):
+    assert is_compressible(content_type) == expected
+
+
+def test_weaken_etag():
+    assert weaken_etag('"abc"') == 'W/"abc"'
+    assert weaken_etag('W/"abc"') == 'W/"abc"'
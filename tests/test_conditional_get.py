@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+from fastapi import Response
+from starlette.requests import Request
+
+import server
+
+
+def request(path: str = "/api/fixtures", query: bytes = b"", **headers) -> Request:
+    return Request({
+        "type": "http", "method": "GET", "path": path, "query_string": query,
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+class VersionsCollection:
+    """In-memory stand-in for the collection_versions collection"""
+
+    def __init__(self):
+        self.documents = {}
+        self.finds = 0
+
+    def find(self, query: dict):
+        self.finds += 1
+        found = [dict(document) for document in self.documents.values()]
+
+        class Cursor:
+            async def to_list(self, length):
+                await asyncio.sleep(0)
+                return found
+        return Cursor()
+
+    async def find_one_and_update(self, query: dict, update: dict, upsert: bool, return_document):
+        document = self.documents.setdefault(query['_id'], {"_id": query['_id'], **update['$setOnInsert'], "version": 0})
+        document['version'] += update['$inc']['version']
+        return dict(document)
+
+
+@pytest.fixture
+def versions(monkeypatch):
+    collection = VersionsCollection()
+    monkeypatch.setattr(server, "db", {server.COLLECTION_VERSIONS_COLLECTION: collection})
+    monkeypatch.setattr(server, "collection_versions", server.CollectionVersions(ttl=1.0))
+    return collection
+
+
+@pytest.fixture
+def listening(monkeypatch):
+    """Pretend the invalidation bus is running, as it is in a served worker"""
+    monkeypatch.setattr(server.invalidation_bus, "active_mode", "change_streams")
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    for cache in server.RESPONSE_CACHES.values():
+        cache.invalidate()
+
+
+@pytest.fixture
+def produced():
+    calls = []
+
+    async def produce():
+        calls.append(1)
+        return Response(b'[]', media_type="application/json")
+    produce.calls = calls
+    return produce
+
+
+ETAG = '"0123abcd"'
+
+
+@pytest.mark.parametrize("if_none_match", [ETAG, f"W/{ETAG}", f'"other", {ETAG}', "*"])
+def test_etag_matches(if_none_match):
+    assert server.etag_matches(request(if_none_match=if_none_match), ETAG)
+
+
+@pytest.mark.parametrize("headers", [{}, {"if_none_match": '"other"'}, {"if_none_match": ""}])
+def test_etag_does_not_match(headers):
+    assert not server.etag_matches(request(**headers), ETAG)
+
+
+def test_etag_depends_on_query_and_versions():
+    versions = {"fixtures": "0"}
+    etag = server.response_etag(request(query=b"limit=5"), versions)
+    assert etag == server.response_etag(request(query=b"limit=5"), dict(versions))
+    assert etag != server.response_etag(request(query=b"limit=6"), versions)
+    assert etag != server.response_etag(request(query=b"limit=5"), {"fixtures": "abc.1"})
+
+
+def test_query_parameter_order_does_not_change_the_etag():
+    versions = {"fixtures": "0"}
+    assert (server.response_etag(request(query=b"limit=5&skip=10"), versions)
+            == server.response_etag(request(query=b"skip=10&limit=5"), versions))
+
+
+def test_matching_if_none_match_is_answered_with_304(versions, produced):
+    first = asyncio.run(server.cached_response("fixtures", request(), produced))
+    etag = first.headers["etag"]
+    second = asyncio.run(server.cached_response("fixtures", request(if_none_match=etag), produced))
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert len(produced.calls) == 1
+
+
+def test_cached_reads_and_304s_do_not_query_the_versions(versions, listening, produced):
+    etag = asyncio.run(server.cached_response("fixtures", request(), produced)).headers["etag"]
+    for _ in range(3):
+        asyncio.run(server.cached_response("fixtures", request(), produced))
+        asyncio.run(server.cached_response("fixtures", request(if_none_match=etag), produced))
+    assert versions.finds == 1
+    assert len(produced.calls) == 1
+
+
+def test_own_write_changes_the_etag_without_a_read(versions, listening, produced):
+    etag = asyncio.run(server.cached_response("fixtures", request(), produced)).headers["etag"]
+    asyncio.run(server.collection_changed("fixtures"))
+    response = asyncio.run(server.cached_response("fixtures", request(if_none_match=etag), produced))
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert versions.finds == 1
+
+
+def test_write_from_another_worker_changes_the_etag(versions, listening, produced):
+    etag = asyncio.run(server.cached_response("fixtures", request(), produced)).headers["etag"]
+    versions.documents["fixtures"] = {"_id": "fixtures", "epoch": "abc", "version": 1}
+    server.remote_collection_changed(server.COLLECTION_VERSIONS_COLLECTION)
+    response = asyncio.run(server.cached_response("fixtures", request(if_none_match=etag), produced))
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_without_a_bus_versions_are_re_read_after_the_ttl(versions, produced, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(server.time, "monotonic", lambda: now[0])
+    etag = asyncio.run(server.cached_response("fixtures", request(), produced)).headers["etag"]
+    versions.documents["fixtures"] = {"_id": "fixtures", "epoch": "abc", "version": 1}
+    assert asyncio.run(server.cached_response("fixtures", request(if_none_match=etag), produced)).status_code == 304
+    now[0] += 1.0
+    assert asyncio.run(server.cached_response("fixtures", request(if_none_match=etag), produced)).status_code == 200
+    assert versions.finds == 2
+
+
+def test_read_racing_a_bump_does_not_overwrite_it(versions, listening):
+    copy = server.collection_versions
+
+    async def race():
+        read = asyncio.ensure_future(copy.get(["fixtures"]))
+        await asyncio.sleep(0)
+        await server.bump_collection_version("fixtures")  # Lands while the read waits on Mongo
+        await read
+        return await copy.get(["fixtures"])
+    assert asyncio.run(race()) == {"fixtures": f"{versions.documents['fixtures']['epoch']}.1"}
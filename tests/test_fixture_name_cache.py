@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+import server
+from server import FixtureNameCache
+
+NAMES = {"f1": "Spring Open", "f2": "Club Shoot"}
+
+
+class Lookups(list):
+    """Every $in query made, in order; ``release`` holds queries until all lookups started"""
+    release: asyncio.Event
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Replace the $in query with a slow in-memory lookup that records every call"""
+    calls = Lookups()
+
+    async def lookup_fixture_names(fixture_ids):
+        fixture_ids = sorted(fixture_ids)
+        calls.append(fixture_ids)
+        await calls.release.wait()
+        if "boom" in fixture_ids:
+            raise RuntimeError("lookup failed")
+        return {fixture_id: NAMES[fixture_id] for fixture_id in fixture_ids if fixture_id in NAMES}
+
+    monkeypatch.setattr(server, "lookup_fixture_names", lookup_fixture_names)
+    return calls
+
+
+def run_concurrently(cache: FixtureNameCache, lookups: Lookups, *id_lists):
+    async def main():
+        lookups.release = asyncio.Event()
+        tasks = [asyncio.create_task(cache.get_many(ids)) for ids in id_lists]
+        await asyncio.sleep(0)  # Let every lookup start before the first query answers
+        lookups.release.set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+    return asyncio.run(main())
+
+
+def test_concurrent_lookups_share_one_query(lookups):
+    cache = FixtureNameCache()
+    results = run_concurrently(cache, lookups, ["f1"], ["f1"], ["f1"])
+    assert results == [{"f1": "Spring Open"}] * 3
+    assert lookups == [["f1"]]
+    assert cache.coalesced == 2
+
+
+def test_only_missing_ids_are_queried(lookups):
+    cache = FixtureNameCache()
+    run_concurrently(cache, lookups, ["f1"])
+    results = run_concurrently(cache, lookups, ["f1", "f2"])
+    assert results == [{"f1": "Spring Open", "f2": "Club Shoot"}]
+    assert lookups == [["f1"], ["f2"]]
+
+
+def test_unknown_ids_are_left_out_and_not_cached(lookups):
+    cache = FixtureNameCache()
+    assert run_concurrently(cache, lookups, ["missing"]) == [{}]
+    run_concurrently(cache, lookups, ["missing"])
+    assert lookups == [["missing"], ["missing"]]
+
+
+def test_a_failed_query_fails_every_waiter_and_is_retried(lookups):
+    cache = FixtureNameCache()
+    results = run_concurrently(cache, lookups, ["boom"], ["boom"])
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache._inflight == {}
+    run_concurrently(cache, lookups, ["boom", "f1"])
+    assert len(lookups) == 2
+
+
+def test_invalidation_forces_a_fresh_lookup(lookups):
+    cache = FixtureNameCache()
+    run_concurrently(cache, lookups, ["f1"])
+    cache.invalidate("f1")
+    run_concurrently(cache, lookups, ["f1"])
+    assert lookups == [["f1"], ["f1"]]
@@ -0,0 +1,46 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+import server
+from tests.filters import matches
+
+
+class JobRunsCollection:
+    """In-memory job_runs with Mongo's upsert behaviour on a unique _id"""
+
+    def __init__(self):
+        self.documents = {}
+
+    async def update_one(self, query: dict, update: dict, upsert: bool):
+        document = self.documents.get(query['_id'])
+        if document is not None and matches(document, query):
+            document.update(update['$set'])
+        elif document is not None:
+            raise DuplicateKeyError("E11000 duplicate key error")
+        else:
+            self.documents[query['_id']] = {"_id": query['_id'], **update['$set']}
+
+
+@pytest.fixture
+def job_runs(monkeypatch):
+    collection = JobRunsCollection()
+    monkeypatch.setattr(server, "db", {server.JOB_RUNS_COLLECTION: collection})
+    return collection
+
+
+def claim(interval: float = 3600) -> bool:
+    return asyncio.run(server.claim_job_run("reconcile", interval))
+
+
+def test_only_the_first_worker_claims_a_run(job_runs):
+    assert claim()
+    assert not claim()
+
+
+def test_next_interval_can_be_claimed_again(job_runs):
+    assert claim()
+    job_runs.documents["reconcile"]['last_run'] -= timedelta(seconds=3600)
+    assert claim()
@@ -0,0 +1,70 @@
+from datetime import datetime
+
+import pytest
+
+import server
+from live_updates import RESYNC
+
+
+def session_document(**fields) -> dict:
+    return {
+        "_id": "object-id", "id": "session-1", "date": datetime(2024, 3, 5), "time": "10:00",
+        "location": "Range", "discipline": "sporting_clays", "total_clays": 50, "clays_hit": 40,
+        "created_at": datetime(2024, 3, 5, 12), "accuracy": 80.0, **fields,
+    }
+
+
+def change(collection: str, operation: str, **fields) -> dict:
+    return {"ns": {"db": "test", "coll": collection}, "operationType": operation, **fields}
+
+
+@pytest.fixture
+def stats_pushes(monkeypatch):
+    pushes = []
+    monkeypatch.setattr(server, "schedule_stats_push", lambda: pushes.append(1))
+    return pushes
+
+
+def test_session_insert_becomes_an_upsert_with_its_calendar_event(stats_pushes):
+    [event] = server.change_to_events(change("shooting_sessions", "insert", fullDocument=session_document()))
+    assert (event['type'], event['op'], event['id']) == ("session", "upsert", "session-1")
+    assert event['data']['date'] == "2024-03-05"
+    assert "_id" not in event['data']
+    assert event['event']['title'] == "Session - Sporting Clays"
+    assert event['event']['accuracy'] == 80.0
+
+
+def test_fixture_update_becomes_an_upsert(stats_pushes):
+    fixture = {"id": "fixture-1", "name": "Open", "date": datetime(2024, 3, 9), "time": "09:00",
+               "location": "Ground", "discipline": "trap", "created_at": datetime(2024, 3, 1)}
+    [event] = server.change_to_events(change("fixtures", "update", fullDocument=fixture))
+    assert (event['type'], event['op'], event['event']['title']) == ("fixture", "upsert", "Open")
+    assert stats_pushes == []
+
+
+def test_delete_carries_the_id_from_the_pre_image(stats_pushes):
+    events = server.change_to_events(change("fixtures", "delete", fullDocumentBeforeChange={"id": "fixture-1"}))
+    assert events == [{"type": "fixture", "op": "delete", "id": "fixture-1"}]
+
+
+def test_delete_without_a_pre_image_asks_for_a_resync(stats_pushes):
+    assert server.change_to_events(change("shooting_sessions", "delete")) == [RESYNC]
+
+
+def test_update_of_a_document_deleted_since_is_dropped(stats_pushes):
+    assert server.change_to_events(change("shooting_sessions", "update", fullDocument=None)) == []
+
+
+def test_other_operations_ask_for_a_resync(stats_pushes):
+    assert server.change_to_events(change("fixtures", "drop")) == [RESYNC]
+
+
+def test_rollup_change_pushes_stats_only(stats_pushes):
+    assert server.change_to_events(change("session_stats", "update")) == []
+    assert stats_pushes == [1]
+
+
+def test_date_only_session_edit_pushes_stats(stats_pushes):
+    # Changes the streak without touching the rollup
+    server.change_to_events(change("shooting_sessions", "update", fullDocument=session_document()))
+    assert stats_pushes == [1]
@@ -0,0 +1,96 @@
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+import server
+from server import SortOrder
+from tests.filters import matches
+
+
+def stored_sessions(count: int, seed: int = 0) -> list:
+    """Sessions as stored, with plenty of ties on date and created_at"""
+    rng = random.Random(seed)
+    created = datetime(2024, 1, 1, 12, 0)
+    return [
+        {
+            "id": f"session-{index:03d}",
+            "date": server.to_bson_date(date(2024, 1, 1) + timedelta(days=rng.randrange(5))),
+            "created_at": created + timedelta(seconds=rng.randrange(3)),
+            "accuracy": rng.choice([60.0, 80.0, 100.0]),
+        }
+        for index in range(count)
+    ]
+
+
+def sort_key(sort_field: str):
+    # Missing values sort below every number, as in Mongo
+    return lambda document: (document.get(sort_field) is not None, document.get(sort_field) or 0,
+                             document['created_at'], document['id'])
+
+
+def read_page(documents: list, limit: int, cursor, sort_field: str, order: SortOrder) -> list:
+    """What find_page returns, with the date projected to YYYY-MM-DD like the list reads"""
+    if cursor:
+        after = server.cursor_filter(cursor, sort_field, order)
+        documents = [document for document in documents if matches(document, after)]
+    documents = sorted(documents, key=sort_key(sort_field), reverse=order == SortOrder.DESC)
+    return [{**document, "date": document['date'].strftime("%Y-%m-%d")} for document in documents[:limit]]
+
+
+def read_all_pages(documents: list, limit: int, sort_field: str, order: SortOrder) -> list:
+    seen, cursor = [], None
+    while True:
+        page = read_page(documents, limit, cursor, sort_field, order)
+        seen.extend(document['id'] for document in page)
+        cursor = server.page_headers(page, limit, sort_field, order).get(server.NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.parametrize("sort_field", ["date", "accuracy"])
+@pytest.mark.parametrize("order", [SortOrder.DESC, SortOrder.ASC])
+@pytest.mark.parametrize("limit", [1, 7, 50])
+def test_pages_cover_every_document_once_in_order(sort_field, order, limit):
+    documents = stored_sessions(60)
+    expected = [document['id'] for document in
+                sorted(documents, key=sort_key(sort_field), reverse=order == SortOrder.DESC)]
+    assert read_all_pages(documents, limit, sort_field, order) == expected
+
+
+@pytest.mark.parametrize("order", [SortOrder.DESC, SortOrder.ASC])
+@pytest.mark.parametrize("limit", [1, 7])
+def test_accuracy_pages_include_sessions_without_accuracy(order, limit):
+    documents = stored_sessions(40)
+    for document in documents[::3]:
+        del document['accuracy']  # Stored before the field existed, not backfilled yet
+    expected = [document['id'] for document in
+                sorted(documents, key=sort_key("accuracy"), reverse=order == SortOrder.DESC)]
+    assert read_all_pages(documents, limit, "accuracy", order) == expected
+
+
+def test_short_page_has_no_next_cursor():
+    page = read_page(stored_sessions(3), 5, None, "date", SortOrder.DESC)
+    assert server.page_headers(page, 5) == {}
+
+
+def test_date_cursor_compares_bson_dates():
+    page = read_page(stored_sessions(5), 1, None, "date", SortOrder.DESC)
+    after = server.cursor_filter(server.encode_cursor(page[0]))
+    assert isinstance(after["$or"][0]["date"]["$lt"], datetime)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", server.encode_token(["date", "desc"])])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        server.cursor_filter(cursor)
+    assert error.value.status_code == 400
+
+
+def test_cursor_for_another_sort_is_rejected():
+    page = read_page(stored_sessions(5), 1, None, "date", SortOrder.DESC)
+    cursor = server.encode_cursor(page[0], "date", SortOrder.DESC)
+    with pytest.raises(HTTPException) as error:
+        server.cursor_filter(cursor, "date", SortOrder.ASC)
+    assert error.value.status_code == 400
@@ -0,0 +1,72 @@
+import pytest
+
+import server
+from server import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A controllable time.monotonic for the server module"""
+    now = [1000.0]
+    monkeypatch.setattr(server.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_hit_and_miss_are_counted():
+    cache = TTLCache("test", max_entries=4, ttl=30)
+    assert cache.get("a") is None
+    cache.set("a", 1, cache.generation)
+    assert cache.get("a") == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = TTLCache("test", max_entries=4, ttl=30)
+    cache.set("a", 1, cache.generation)
+    clock[0] += 29.9
+    assert cache.get("a") == 1
+    clock[0] += 0.1
+    assert cache.get("a") is None
+    assert cache.expirations == 1
+    assert cache.stats()['entries'] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache("test", max_entries=2, ttl=30)
+    cache.set("a", 1, cache.generation)
+    cache.set("b", 2, cache.generation)
+    cache.get("a")
+    cache.set("c", 3, cache.generation)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_value_computed_before_an_invalidation_is_not_stored():
+    cache = TTLCache("test", max_entries=4, ttl=30)
+    generation = cache.generation
+    cache.invalidate()  # A write lands while the value is being computed
+    cache.set("a", "stale", generation)
+    assert cache.get("a") is None
+    cache.set("a", "fresh", cache.generation)
+    assert cache.get("a") == "fresh"
+
+
+def test_invalidating_one_key_keeps_the_others():
+    cache = TTLCache("test", max_entries=4, ttl=30)
+    cache.set("a", 1, cache.generation)
+    cache.set("b", 2, cache.generation)
+    generation = cache.generation
+    cache.invalidate("a")
+    assert cache.get("a") is None and cache.get("b") == 2
+    assert cache.generation == generation + 1
+    assert cache.invalidations == 1
+
+
+def test_collection_writes_invalidate_the_caches_built_from_them():
+    for cache in server.RESPONSE_CACHES.values():
+        cache.set("key", "value", cache.generation)
+    server.invalidate_collection("fixtures")
+    assert server.RESPONSE_CACHES["fixtures"].get("key") is None
+    assert server.RESPONSE_CACHES["calendar"].get("key") is None
+    assert server.RESPONSE_CACHES["sessions"].get("key") == "value"
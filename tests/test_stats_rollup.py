@@ -0,0 +1,244 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+import server
+from server import STATS_ROLLUP_ID, ShootingSessionUpdate
+from tests.filters import matches
+
+
+class Result:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+class Aggregation:
+    def __init__(self, documents: list):
+        self.documents = documents
+
+    async def to_list(self, length):
+        return self.documents
+
+
+def evaluate(expression, document: dict):
+    if expression == server.SESSION_ACCURACY_EXPR:
+        return server.session_accuracy(document)
+    if isinstance(expression, str):
+        return document[expression[1:]]
+    return expression
+
+
+class SessionsCollection:
+    """Just enough of shooting_sessions for the stats rollup paths"""
+
+    def __init__(self, documents: list):
+        self.documents = documents
+        self.pipelines = []
+
+    def _find(self, query: dict) -> list:
+        return [document for document in self.documents if matches(document, query)]
+
+    async def find_one(self, query: dict, projection: dict, sort=None):
+        found = self._find(query)
+        for field, direction in reversed(sort or []):
+            found.sort(key=lambda d: (d.get(field) is not None, d.get(field) or 0), reverse=direction < 0)
+        return dict(found[0]) if found else None
+
+    def aggregate(self, pipeline: list) -> Aggregation:
+        self.pipelines.append(pipeline)
+        documents = self.documents
+        for stage in pipeline:
+            if "$match" in stage:
+                documents = [document for document in documents if matches(document, stage["$match"])]
+            elif "$group" in stage:
+                group = stage["$group"]
+                keys = {evaluate(group['_id'], document) for document in documents}
+                documents = [
+                    {"_id": key, **{
+                        name: (sum if "$sum" in spec else max)(
+                            evaluate(next(iter(spec.values())), document)
+                            for document in documents if evaluate(group['_id'], document) == key
+                        )
+                        for name, spec in group.items() if name != "_id"
+                    }}
+                    for key in keys
+                ]
+        return Aggregation(documents)
+
+    async def find_one_and_update(self, query: dict, update, projection: dict, return_document):
+        found = self._find(query)
+        if not found:
+            return None
+        document = found[0]
+        before = dict(document)
+        if isinstance(update, list):  # The pipeline form find_one_and_set uses for computed fields
+            document.update({field: value["$literal"] for field, value in update[0]["$set"].items()})
+            document.update({field: evaluate(value, document) for field, value in update[1]["$set"].items()})
+        else:
+            document.update(update["$set"])
+        return before if return_document == server.ReturnDocument.BEFORE else dict(document)
+
+    async def delete_many(self, query: dict) -> Result:
+        deleted = self._find(query)
+        self.documents[:] = [document for document in self.documents if document not in deleted]
+        return Result(deleted_count=len(deleted))
+
+
+class StatsCollection:
+    def __init__(self, rollup: dict):
+        self.rollup = rollup
+
+    async def find_one_and_update(self, query: dict, update: dict, return_document):
+        for field, value in update.get("$inc", {}).items():
+            if field.startswith("disciplines."):
+                disciplines = self.rollup['disciplines']
+                name = field.split(".", 1)[1]
+                disciplines[name] = disciplines.get(name, 0) + value
+            else:
+                self.rollup[field] += value
+        for field, value in update.get("$max", {}).items():
+            self.rollup[field] = max(self.rollup[field], value)
+        return dict(self.rollup)
+
+    async def update_one(self, query: dict, update: dict):
+        if all(self.rollup.get(field) == value for field, value in query.items() if field != "_id"):
+            self.rollup.update(update["$set"])
+
+
+class VersionsCollection:
+    async def find_one_and_update(self, query: dict, update: dict, upsert: bool, return_document):
+        return {"_id": query['_id'], "epoch": "test", "version": 1}
+
+
+class FakeDB(dict):
+    def __getattr__(self, name):
+        return self[name]
+
+
+def stored_session(session_id: str, total_clays: int, clays_hit: int, discipline: str = "trap",
+                   fixture_id=None, backfilled: bool = True) -> dict:
+    session = {
+        "id": session_id, "date": datetime(2024, 3, 1), "time": "10:00", "location": "Range",
+        "discipline": discipline, "total_clays": total_clays, "clays_hit": clays_hit,
+        "fixture_id": fixture_id, "created_at": datetime(2024, 3, 1, 12),
+    }
+    if backfilled:
+        session['accuracy'] = server.session_accuracy(session)
+    return session
+
+
+def expected_rollup(sessions: list) -> dict:
+    disciplines = {}
+    for session in sessions:
+        disciplines[session['discipline']] = disciplines.get(session['discipline'], 0) + 1
+    return {
+        "_id": STATS_ROLLUP_ID,
+        "total_sessions": len(sessions),
+        "total_clays": sum(session['total_clays'] for session in sessions),
+        "total_hits": sum(session['clays_hit'] for session in sessions),
+        "best_session_accuracy": max((server.session_accuracy(session) for session in sessions), default=0),
+        "disciplines": disciplines,
+    }
+
+
+def without_empty_disciplines(rollup: dict) -> dict:
+    return {**rollup, "disciplines": {name: count for name, count in rollup['disciplines'].items() if count}}
+
+
+@pytest.fixture
+def stats_db(monkeypatch):
+    def build(sessions: list) -> FakeDB:
+        db = FakeDB(
+            shooting_sessions=SessionsCollection(sessions),
+            session_stats=StatsCollection(expected_rollup(sessions)),
+        )
+        db[server.COLLECTION_VERSIONS_COLLECTION] = VersionsCollection()
+        monkeypatch.setattr(server, "db", db)
+        monkeypatch.setattr(server, "collection_versions", server.CollectionVersions())
+        return db
+    return build
+
+
+def test_stats_delta_moves_a_session_between_disciplines():
+    before = stored_session("a", 25, 20, "trap")
+    after = {**before, "discipline": "skeet", "clays_hit": 22}
+    assert server._stats_delta(after, 1, server._stats_delta(before, -1)) == {
+        "total_sessions": 0, "total_clays": 0, "total_hits": 2,
+        "disciplines.trap": -1, "disciplines.skeet": 1,
+    }
+
+
+def test_added_session_raises_the_best_accuracy(stats_db):
+    db = stats_db([stored_session("a", 25, 20)])
+    added = stored_session("b", 25, 24)
+    asyncio.run(server.apply_stats_delta(server._stats_delta(added, 1), added_accuracy=96.0))
+    assert db.session_stats.rollup['best_session_accuracy'] == 96.0
+    assert db.session_stats.rollup['total_sessions'] == 2
+
+
+def test_removing_the_best_session_finds_the_next_through_the_index(stats_db):
+    sessions = [stored_session("a", 25, 20), stored_session("b", 25, 25), stored_session("c", 25, 15)]
+    db = stats_db(sessions)
+    removed = sessions.pop(1)
+    asyncio.run(server.apply_stats_delta(server._stats_delta(removed, -1), removed_accuracy=100.0))
+    assert db.session_stats.rollup == expected_rollup(sessions)
+    assert db.shooting_sessions.pipelines == []
+
+
+def test_removing_the_best_session_before_the_backfill_computes_every_accuracy(stats_db):
+    sessions = [stored_session("a", 25, 20), stored_session("b", 25, 25),
+                stored_session("c", 25, 23, backfilled=False)]
+    db = stats_db(sessions)
+    removed = sessions.pop(1)
+    asyncio.run(server.apply_stats_delta(server._stats_delta(removed, -1), removed_accuracy=100.0))
+    assert db.session_stats.rollup['best_session_accuracy'] == 92.0
+
+
+def test_best_accuracy_is_left_alone_when_it_changed_concurrently(stats_db):
+    sessions = [stored_session("a", 25, 20), stored_session("b", 25, 25)]
+    db = stats_db(sessions)
+    db.session_stats.rollup['best_session_accuracy'] = 100.0
+    # A write racing this one already replaced the best with a higher value
+    asyncio.run(server.apply_stats_delta({}, removed_accuracy=90.0))
+    assert db.session_stats.rollup['best_session_accuracy'] == 100.0
+
+
+@pytest.mark.parametrize("update", [
+    ShootingSessionUpdate(clays_hit=10),
+    ShootingSessionUpdate(discipline="skeet", total_clays=50, clays_hit=45),
+    ShootingSessionUpdate(total_clays=0, clays_hit=0),
+])
+def test_updating_a_session_keeps_the_rollup_consistent(stats_db, update):
+    sessions = [stored_session("a", 25, 20), stored_session("b", 25, 25)]
+    db = stats_db(sessions)
+    updated = asyncio.run(server.update_session("b", update))
+    assert updated.accuracy == server.session_accuracy(sessions[1])
+    assert without_empty_disciplines(db.session_stats.rollup) == expected_rollup(sessions)
+
+
+def test_updating_other_fields_leaves_the_rollup_alone(stats_db):
+    db = stats_db([stored_session("a", 25, 20)])
+    rollup = dict(db.session_stats.rollup)
+    asyncio.run(server.update_session("a", ShootingSessionUpdate(location="Other Range")))
+    assert db.session_stats.rollup == rollup
+
+
+def test_deleting_fixture_sessions_takes_them_out_of_the_rollup(stats_db):
+    sessions = [
+        stored_session("a", 25, 25, "trap", fixture_id="f1"),
+        stored_session("b", 50, 40, "skeet", fixture_id="f1"),
+        stored_session("c", 25, 21, "skeet", fixture_id="f2"),
+        stored_session("d", 25, 18, "trap"),
+    ]
+    db = stats_db(sessions)
+    assert asyncio.run(server.delete_fixture_sessions("f1")) == 2
+    assert [session['id'] for session in sessions] == ["c", "d"]
+    assert without_empty_disciplines(db.session_stats.rollup) == expected_rollup(sessions)
+
+
+def test_deleting_a_fixture_without_sessions_changes_nothing(stats_db):
+    db = stats_db([stored_session("a", 25, 20)])
+    rollup = dict(db.session_stats.rollup)
+    assert asyncio.run(server.delete_fixture_sessions("missing")) == 0
+    assert db.session_stats.rollup == rollup